@@ -16,7 +16,7 @@ source.dir = src
 source.include_exts = py,png,jpg,kv,atlas
 
 # (list) List of inclusions using pattern matching
-source.include_patterns = src/crapette/images/*.png,src/crapette/images/png/2x/*.png
+source.include_patterns = src/crapette/images/*.png,src/crapette/images/png/2x/*.png,src/crapette/images/atlas/*
 
 # (list) Source files to exclude (let empty to not exclude anything)
 #source.exclude_exts = spec
@@ -34,6 +34,7 @@ a = Analysis(
         ("crapette/crapette.kv", "crapette/"),
         ("crapette/images/*.png", "crapette/images/"),
         ("crapette/images/png/2x/*.png", "crapette/images/png/2x/"),
+        ("crapette/images/atlas/*", "crapette/images/atlas/"),
     ],
     hookspath=[],  # hookspath(),
     runtime_hooks=[],  # runtime_hooks(),
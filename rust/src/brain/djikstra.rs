@@ -1,6 +1,7 @@
 use log::{debug, error, info, trace, warn};
 use std::collections::{BTreeSet, BinaryHeap, HashMap};
 use std::io::stdin;
+use std::sync::atomic::{AtomicBool, Ordering as AtomicOrdering};
 use std::time::Instant;
 
 use crate::core::board::Board;
@@ -19,27 +20,36 @@ pub struct RustBrainConfig {
     reproducible: bool,
 }
 
+/// Compute the best series of moves.
+///
+/// The search stops early and returns `None` when `cancelled` is set,
+/// which can be done from another thread.
 pub fn compute_states(
     board: &Board,
     active_player: Player,
     crapette_mode: bool,
     log_path: &str,
-) -> CardActions {
+    cancelled: &AtomicBool,
+) -> Option<CardActions> {
     let start_time = Instant::now();
 
-    let (moves, nb_nodes_visited) = brain_djikstra(board, active_player);
+    let (moves, nb_nodes_visited) = brain_djikstra(board, active_player, cancelled)?;
 
     let duration = start_time.elapsed();
-    println!("nb_nodes_visited: {}", nb_nodes_visited);
-    println!("duration: {:#?}", duration);
-    println!(
-        "duration per node: {:#?}/node",
+    info!(
+        "AI time: {:#?} for {} possibilities ({:#?} each on average)",
+        duration,
+        nb_nodes_visited,
         duration / nb_nodes_visited as u32
     );
-    moves
+    Some(moves)
 }
 
-pub fn brain_djikstra(board: &Board, active_player: Player) -> (CardActions, usize) {
+pub fn brain_djikstra(
+    board: &Board,
+    active_player: Player,
+    cancelled: &AtomicBool,
+) -> Option<(CardActions, usize)> {
     trace!("BrainDijkstra.search");
 
     // Create tables
@@ -59,6 +69,10 @@ pub fn brain_djikstra(board: &Board, active_player: Player) -> (CardActions, usi
 
     // Look for the best attainable node
     loop {
+        if cancelled.load(AtomicOrdering::Relaxed) {
+            info!("Search cancelled after {} nodes", nb_nodes_visited);
+            return None;
+        }
         debug!("{} nodes to visit", known_unvisited_nodes.len());
         match known_unvisited_nodes.pop_first() {
             None => {
@@ -95,7 +109,7 @@ pub fn brain_djikstra(board: &Board, active_player: Player) -> (CardActions, usi
     info!("Initial board:\n{}", board.to_string(true));
     info!("Final board:\n{}", best_node.board.to_string(true));
 
-    (moves, nb_nodes_visited)
+    Some((moves, nb_nodes_visited))
 }
 
 // moves can be empty if the stock is empty and not the crape
@@ -149,7 +149,7 @@ impl Board {
         }
     }
 
-    fn pile_from_type(&self, pile_type: &PileType) -> &Pile {
+    pub fn pile_from_type(&self, pile_type: &PileType) -> &Pile {
         match pile_type {
             PileType::Foundation {
                 id: foundation_id, ..
@@ -352,6 +352,82 @@ impl Board {
         new_board
     }
 
+    /// Piles in the order of the byte encoding, see `to_bytes`.
+    ///
+    /// It's the order of `Board.piles` on the Python side.
+    fn piles_in_byte_order(&self) -> [&Pile; NB_PILES_TOTAL] {
+        [
+            &self.stock[0],
+            &self.waste[0],
+            &self.crape[0],
+            &self.stock[1],
+            &self.waste[1],
+            &self.crape[1],
+            &self.foundation[0],
+            &self.foundation[1],
+            &self.foundation[2],
+            &self.foundation[3],
+            &self.foundation[4],
+            &self.foundation[5],
+            &self.foundation[6],
+            &self.foundation[7],
+            &self.tableau[0],
+            &self.tableau[1],
+            &self.tableau[2],
+            &self.tableau[3],
+            &self.tableau[4],
+            &self.tableau[5],
+            &self.tableau[6],
+            &self.tableau[7],
+        ]
+    }
+
+    /// Compact encoding of the board, shared with the Python side.
+    ///
+    /// For each pile, the number of cards is followed by the cards encoded with
+    /// `Card::to_byte`. Unlike `encode`, the piles are not sorted and the encoding
+    /// contains everything needed to rebuild the board, see `from_bytes`.
+    pub fn to_bytes(&self) -> Vec<u8> {
+        let mut data = Vec::with_capacity(NB_PILES_TOTAL + 2 * NB_CARDS);
+        for pile in self.piles_in_byte_order() {
+            data.push(pile.nb_cards() as u8);
+            data.extend(pile.cards.iter().map(|card| card.to_byte()));
+        }
+        data
+    }
+
+    /// Create a board from an encoding made by `to_bytes`.
+    pub fn from_bytes(data: &[u8]) -> Result<Self, String> {
+        let mut board = Board::new();
+        let mut offset = 0;
+        let piles = board
+            .stock
+            .iter_mut()
+            .zip(board.waste.iter_mut())
+            .zip(board.crape.iter_mut())
+            .flat_map(|((stock, waste), crape)| [stock, waste, crape])
+            .chain(board.foundation.iter_mut())
+            .chain(board.tableau.iter_mut());
+        for pile in piles {
+            let nb_cards = *data.get(offset).ok_or("Board encoding is too short")? as usize;
+            offset += 1;
+            let cards = data
+                .get(offset..offset + nb_cards)
+                .ok_or("Board encoding is too short")?;
+            for &byte in cards {
+                pile.add(Card::from_byte(byte)?);
+            }
+            offset += nb_cards;
+        }
+        if offset != data.len() {
+            return Err(format!(
+                "Invalid board encoding, {} bytes left",
+                data.len() - offset
+            ));
+        }
+        Ok(board)
+    }
+
     pub fn encode(&self) -> Vec<u8> {
         // An encoding contains each card and each pile size
         // The capacity should be constant
@@ -485,6 +561,17 @@ mod tests {
         }
     }
 
+    #[test]
+    fn test_bytes_roundtrip() {
+        let mut board = Board::new();
+        let mut rng = new_rng("test");
+        board.new_game(&mut rng);
+        let data = board.to_bytes();
+        let decoded = Board::from_bytes(&data).unwrap();
+        assert_eq!(decoded.to_bytes(), data);
+        assert!(Board::from_bytes(&data[..data.len() - 1]).is_err());
+    }
+
     #[test]
     fn test_check_win() {
         let mut board = Board::new();
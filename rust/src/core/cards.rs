@@ -5,7 +5,7 @@ use std::fmt;
 use std::hash::{Hash, Hasher};
 
 use super::players::Player;
-use super::ranks::Rank;
+use super::ranks::{Rank, MAX_RANK, MIN_RANK};
 use super::suits::{Color, Suit};
 
 #[derive(Debug, Clone, Copy)]
@@ -23,6 +23,10 @@ fn rank_suit_to_id(&rank: &Rank, &suit: &Suit) -> u8 {
     (rank.as_u8() & 0x0F) | ((suit as u8 & 0x03) << 4)
 }
 
+/// Suit letters in the order used by the byte encoding, see `Card::to_byte`
+/// It's the order of `Card.SUITS` on the Python side.
+const BYTE_SUITS: [char; 4] = ['d', 'h', 'c', 's'];
+
 impl Card {
     // hash goes up to 4*12+4 = 52
     pub fn new(rank: Rank, suit: Suit, player: Player) -> Self {
@@ -75,6 +79,31 @@ impl Card {
         self.id
     }
 
+    /// Encode the card in a single byte, shared with the Python side.
+    ///
+    /// Bits 0-3 are the rank, bits 4-5 the suit index in `BYTE_SUITS`,
+    /// bit 6 the player and bit 7 if the card is face up.
+    pub fn to_byte(&self) -> u8 {
+        let suit_index = BYTE_SUITS
+            .iter()
+            .position(|&letter| letter == self.suit.letter())
+            .expect("All suits are in BYTE_SUITS") as u8;
+        self.rank.as_u8() | suit_index << 4 | (self.player as u8) << 6 | (self.face_up as u8) << 7
+    }
+
+    /// Decode a card encoded with `to_byte`.
+    pub fn from_byte(byte: u8) -> Result<Self, String> {
+        let rank = byte & 0x0F;
+        if !(MIN_RANK..=MAX_RANK).contains(&rank) {
+            return Err(format!("Incorrect card rank {rank} in byte {byte:#04x}"));
+        }
+        let suit = Suit::from(BYTE_SUITS[(byte >> 4 & 0x03) as usize]);
+        let player = Player::from(byte >> 6 & 0x01);
+        let mut card = Card::new(Rank::from(rank), suit, player);
+        card.face_up = byte & 0x80 != 0;
+        Ok(card)
+    }
+
     pub fn set_face_up(&mut self) {
         self.face_up = true;
     }
@@ -187,6 +216,18 @@ mod tests {
         Card::quick("13c1");
     }
 
+    #[test]
+    fn test_byte() {
+        let mut card = Card::quick("10h1");
+        assert_eq!(card.to_byte(), 10 | 1 << 4 | 1 << 6 | 1 << 7);
+        card.face_up = false;
+        let decoded = Card::from_byte(card.to_byte()).unwrap();
+        assert_eq!(decoded, card);
+        assert_eq!(decoded.player(), &Player::Player1);
+        assert_eq!(decoded.face_up, false);
+        assert!(Card::from_byte(0).is_err());
+    }
+
     #[test]
     fn test_eq() {
         let c = Card::quick("1d0");
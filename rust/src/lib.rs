@@ -10,7 +10,13 @@ mod brain;
 use brain::djikstra::brain_djikstra;
 
 use brain::djikstra::compute_states;
+use core::moves::{CardAction, CardActions};
+use log::debug;
+use pyo3::exceptions::{PyRuntimeError, PyValueError};
 use pyo3::prelude::*;
+use std::sync::atomic::{AtomicBool, Ordering as AtomicOrdering};
+use std::sync::{Arc, Mutex, MutexGuard};
+use std::thread::{self, JoinHandle};
 
 pub struct GameConfig<'a> {
     pub active_player: usize,
@@ -18,100 +24,200 @@ pub struct GameConfig<'a> {
     pub log_path: &'a str,
 }
 
-#[derive(FromPyObject, Debug)]
-struct RustyCard {
-    rank: u8,
-    suit: char,
-    player: u8,
-    _face_up: bool,
+/// Python representation of a card: (rank, suit, player)
+type PyCard = (u8, char, u8);
+
+/// Python representation of a pile: (kind, index)
+///
+/// The index is the pile id for foundation and tableau piles, the player otherwise.
+type PyPile = (&'static str, u8);
+
+/// Python representation of a CardAction: (kind, card, origin, destination)
+///
+/// The kind is "move", "flip" or "flip_waste".
+/// For a flip, the pile is given as the origin.
+type PyAction = (
+    &'static str,
+    Option<PyCard>,
+    Option<PyPile>,
+    Option<PyPile>,
+);
+
+fn card_to_py(card: &Card) -> PyCard {
+    (card.rank().as_u8(), card.suit().letter(), *card.player() as u8)
 }
-#[derive(FromPyObject, Debug)]
-struct RustyPile {
-    // name: String,
-    _cards: Vec<RustyCard>,
+
+fn pile_to_py(pile_type: &PileType) -> PyPile {
+    match pile_type {
+        PileType::Foundation { id, .. } => ("foundation", *id),
+        PileType::Tableau { id } => ("tableau", *id),
+        PileType::Stock { player } => ("stock", *player as u8),
+        PileType::Waste { player } => ("waste", *player as u8),
+        PileType::Crape { player } => ("crape", *player as u8),
+    }
 }
 
-#[derive(FromPyObject, Debug)]
-struct RustyBoard {
-    players_piles: Vec<Vec<RustyPile>>, //Vec<Vec<Vec<RustyCard>>>,
-    foundation_piles: Vec<RustyPile>,   //Vec<Vec<RustyCard>>,
-    tableau_piles: Vec<RustyPile>,      //Vec<Vec<RustyCard>>,
+/// Convert the actions to their Python representation.
+///
+/// The actions are replayed on a copy of the board to know which card is flipped.
+fn actions_to_py(board: &Board, actions: &CardActions) -> Vec<PyAction> {
+    let mut board = board.clone();
+    actions
+        .iter()
+        .map(|action| {
+            let py_action = match action {
+                CardAction::Move {
+                    card,
+                    origin,
+                    destination,
+                } => (
+                    "move",
+                    Some(card_to_py(card)),
+                    Some(pile_to_py(origin)),
+                    Some(pile_to_py(destination)),
+                ),
+                CardAction::Flip { pile } => (
+                    "flip",
+                    board.pile_from_type(pile).top_card().map(card_to_py),
+                    Some(pile_to_py(pile)),
+                    None,
+                ),
+                CardAction::FlipWaste => ("flip_waste", None, None, None),
+            };
+            board.apply_action(action);
+            py_action
+        })
+        .collect()
 }
 
-fn fill_pile(pile: &mut Pile, py_pile: &RustyPile) {
-    for py_card in py_pile._cards.iter() {
-        let mut card = Card::new(
-            Rank::from(py_card.rank),
-            Suit::from(py_card.suit),
-            Player::from(py_card.player),
-        );
-        card.face_up = py_card._face_up;
-        pile.add(card)
-    }
+/// Compute the best series of moves given a game state
+///
+/// The moves are returned as a list of (kind, card, origin, destination) tuples,
+/// see `crapette.brain.brainrust.moves_from_rust` for the conversion.
+///
+/// The board is given in the compact encoding of `Board.to_bytes`, which is read
+/// directly from the Python bytes buffer.
+///
+/// The GIL is released during the search.
+#[pyfunction]
+fn compute(
+    py: Python,
+    board: &[u8],
+    active_player: usize,
+    crapette_mode: bool,
+    log_path: &str,
+) -> PyResult<Vec<PyAction>> {
+    let board = Board::from_bytes(board).map_err(PyValueError::new_err)?;
+    debug!("Board from Python:\n{}", board.to_string(true));
+
+    let actions = py.allow_threads(|| {
+        compute_states(
+            &board,
+            Player::from(active_player),
+            crapette_mode,
+            log_path,
+            &AtomicBool::new(false),
+        )
+    });
+    let actions = actions.expect("A search which can not be cancelled was cancelled");
+    Ok(actions_to_py(&board, &actions))
 }
 
-fn parse_python_board(py_board: &PyAny) -> Board {
-    let mut board = Board::new();
-
-    let rusty_board: RustyBoard = py_board.extract().expect("Invalid Board from Python");
-
-    // TODO : Check that the iterators have the same size
-    for player in PLAYERS {
-        fill_pile(
-            &mut board.stock[player],
-            &rusty_board.players_piles[player as usize][0],
-        );
-        fill_pile(
-            &mut board.waste[player],
-            &rusty_board.players_piles[player as usize][1],
-        );
-        fill_pile(
-            &mut board.crape[player],
-            &rusty_board.players_piles[player as usize][2],
-        );
+/// Result of a search: None if cancelled, the moves otherwise
+type SearchResult = Option<Vec<PyAction>>;
+
+/// Handle on a search running in a background thread, see `spawn_compute`.
+#[pyclass]
+struct SearchHandle {
+    cancelled: Arc<AtomicBool>,
+    result: Arc<Mutex<Option<SearchResult>>>,
+    thread: Option<JoinHandle<()>>,
+}
+
+#[pymethods]
+impl SearchHandle {
+    /// Check if the search is finished, without blocking.
+    fn done(&self) -> PyResult<bool> {
+        Ok(self.lock_result()?.is_some())
     }
-    let it = board
-        .foundation
-        .iter_mut()
-        .zip(rusty_board.foundation_piles.iter());
-    for (pile, py_pile) in it {
-        fill_pile(pile, py_pile)
+
+    /// Ask the search to stop as soon as possible.
+    ///
+    /// The cancellation is cooperative: the search checks the flag between two nodes.
+    fn cancel(&self) {
+        self.cancelled.store(true, AtomicOrdering::Relaxed);
     }
-    let it = board
-        .tableau
-        .iter_mut()
-        .zip(rusty_board.tableau_piles.iter());
-    for (pile, py_pile) in it {
-        fill_pile(pile, py_pile)
+
+    #[getter]
+    fn cancelled(&self) -> bool {
+        self.cancelled.load(AtomicOrdering::Relaxed)
     }
 
-    return board;
+    /// Wait for the end of the search and return the moves, or None if cancelled.
+    ///
+    /// The GIL is released while waiting.
+    fn result(&mut self, py: Python) -> PyResult<SearchResult> {
+        if let Some(thread) = self.thread.take() {
+            py.allow_threads(|| thread.join())
+                .map_err(|_| PyRuntimeError::new_err("Search thread panicked"))?;
+        }
+        self.lock_result()?
+            .clone()
+            .ok_or_else(|| PyRuntimeError::new_err("Search thread finished without a result"))
+    }
 }
 
-/// Compute the best series of moves given a game state
+impl SearchHandle {
+    /// Lock the result, the lock is poisoned if the search thread panicked.
+    fn lock_result(&self) -> PyResult<MutexGuard<'_, Option<SearchResult>>> {
+        self.result
+            .lock()
+            .map_err(|_| PyRuntimeError::new_err("Search thread panicked"))
+    }
+}
+
+/// Start computing the best series of moves in a background thread.
+///
+/// Same as `compute`, but returns immediately with a `SearchHandle`.
 #[pyfunction]
-fn compute(
-    board: &PyAny,
+fn spawn_compute(
+    board: &[u8],
     active_player: usize,
     crapette_mode: bool,
-    log_path: &str,
-) -> PyResult<String> {
-    let game_config = GameConfig {
-        active_player: active_player,
-        crapette_mode: crapette_mode,
-        log_path: log_path,
-    };
+    log_path: String,
+) -> PyResult<SearchHandle> {
+    let board = Board::from_bytes(board).map_err(PyValueError::new_err)?;
 
-    let board = parse_python_board(board);
-    println!("{}", board.to_string(true));
+    let cancelled = Arc::new(AtomicBool::new(false));
+    let result = Arc::new(Mutex::new(None));
+    let thread = {
+        let cancelled = Arc::clone(&cancelled);
+        let result = Arc::clone(&result);
+        thread::spawn(move || {
+            let actions = compute_states(
+                &board,
+                Player::from(active_player),
+                crapette_mode,
+                &log_path,
+                &cancelled,
+            );
+            let py_actions = actions.map(|actions| actions_to_py(&board, &actions));
+            *result.lock().expect("Search result lock poisoned") = Some(py_actions);
+        })
+    };
 
-    compute_states(&board, Player::from(active_player), crapette_mode, "");
-    Ok("toto".to_string())
+    Ok(SearchHandle {
+        cancelled,
+        result,
+        thread: Some(thread),
+    })
 }
 
 /// A Python module implemented in Rust.
 #[pymodule]
 fn rust_brain(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(compute, m)?)?;
+    m.add_function(wrap_pyfunction!(spawn_compute, m)?)?;
+    m.add_class::<SearchHandle>()?;
     Ok(())
 }
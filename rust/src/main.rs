@@ -4,6 +4,7 @@
 use clap::Parser;
 use env_logger;
 use env_logger::Env;
+use std::sync::atomic::AtomicBool;
 
 use crate::core::game_manager::GameManager;
 
@@ -52,5 +53,6 @@ fn main() {
         game_manager.config.active_player.unwrap(),
         false,
         "",
+        &AtomicBool::new(false),
     );
 }
@@ -1,2 +1,8 @@
 """Crapette card game based on the Kivy framework."""
+
+import timeit
+
 __version__ = "0.0.1"
+
+# Start of the application, before importing Kivy, see `CrapetteApp.on_first_frame`
+START_TIME = timeit.default_timer()
@@ -0,0 +1,306 @@
+"""Reproducible benchmark of the AI search.
+
+The AI plays a turn on a fixed corpus of boards, the custom test games and seeded
+deals, for every combination of the `BrainConfig` search flags.
+The results can be saved as a baseline, and compared to it later:
+
+    python -m crapette.benchmark --save baseline.json
+    python -m crapette.benchmark --baseline baseline.json
+
+The comparison fails if the chosen moves changed, or if the time or the memory
+got worse than the tolerance.
+
+The boards can also be loaded from snapshot files, see `crapette.core.snapshot`:
+
+    python -m crapette.benchmark --save-snapshots corpus.snapshot --no-memory
+    python -m crapette.benchmark --snapshots corpus.snapshot
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from . import custom_test_games
+from .brain.config import ENGINES, BrainConfig
+from .core.game_config import GameConfig
+from .core.snapshot import (
+    dump_snapshot,
+    load_snapshot,
+    load_snapshots,
+    save_snapshots,
+)
+from .simulate import GameStats, new_headless_game, play_turn
+
+# Flags changing the search, the other ones don't change the result
+SEARCH_FLAGS = ("shortcut", "filter_piles_orig", "filter_piles_orig_aggressive")
+
+# Absolute slack on the times compared to the baseline, small times are noisy
+TIME_SLACK = 0.01  # s
+
+
+def corpus(
+    nb_deals: int, first_seed: int, nb_turns: int
+) -> dict[str, Callable[[], GameConfig]]:
+    """Factories of the boards to benchmark, by name.
+
+    The seeded deals are played for a few turns first, since the first turns
+    of a game are trivial for the AI.
+    """
+
+    def custom_game(name):
+        def factory():
+            game_config = GameConfig(custom_game=name)
+            game_config.board.set_game_config(game_config)
+            getattr(custom_test_games, name)(game_config.board)
+            return game_config
+
+        return factory
+
+    def deal(seed):
+        game_config = new_headless_game(seed)
+        stats = GameStats(seed)
+        for _ in range(nb_turns):
+            if play_turn(game_config, BrainConfig(), stats):
+                break
+        return snapshot_factory(dump_snapshot(game_config))
+
+    positions = {name: custom_game(name) for name in custom_test_games.game_names()}
+    for seed in range(first_seed, first_seed + nb_deals):
+        positions[f"seed_{seed}"] = deal(seed)
+    return positions
+
+
+def snapshot_factory(snapshot: bytes) -> Callable[[], GameConfig]:
+    return lambda: load_snapshot(snapshot)
+
+
+def snapshots_corpus(paths: list[Path]) -> dict[str, Callable[[], GameConfig]]:
+    """Factories of the boards saved in snapshot files, see `crapette.core.snapshot`."""
+    positions = {}
+    for path in paths:
+        for index, game_config in enumerate(load_snapshots(path)):
+            snapshot = dump_snapshot(game_config)
+            positions[f"{path.stem}_{index}"] = snapshot_factory(snapshot)
+    return positions
+
+
+def brain_configs(engine: str) -> dict[str, BrainConfig]:
+    """All the combinations of the search flags, by name."""
+    configs = {}
+    for values in itertools.product((True, False), repeat=len(SEARCH_FLAGS)):
+        flags = dict(zip(SEARCH_FLAGS, values, strict=True))
+        name = ",".join(f"{flag}={int(value)}" for flag, value in flags.items())
+        configs[name] = BrainConfig(engine=engine, **flags)
+    return configs
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Nearest-rank percentile."""
+    values = sorted(values)
+    index = max(0, round(percent / 100 * len(values)) - 1)
+    return values[index]
+
+
+def run_turn(factory: Callable[[], GameConfig], ai_config: BrainConfig) -> dict:
+    """Let the AI play the turn, and return its time, number of nodes, and moves."""
+    game_config = factory()
+    stats = GameStats(game_config.seed)
+    moves = []
+    play_turn(game_config, ai_config, stats, moves)
+    return {
+        "time": sum(stats.ai_times),
+        "nodes": stats.nodes_expanded,
+        "moves": [list(move) for move in moves],
+    }
+
+
+def measure_memory(factory: Callable[[], GameConfig], ai_config: BrainConfig) -> int:
+    """Peak memory allocated during the turn, in bytes.
+
+    It's a separate run, since tracemalloc slows down the search.
+    """
+    game_config = factory()
+
+    tracemalloc.start()
+    try:
+        play_turn(game_config, ai_config, GameStats(game_config.seed))
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmark(
+    positions: dict[str, Callable[[], GameConfig]],
+    configs: dict[str, BrainConfig],
+    repeat: int,
+    memory: bool,
+) -> dict:
+    results = {}
+    for config_name, ai_config in configs.items():
+        config_results = {}
+        for position_name, factory in positions.items():
+            runs = [run_turn(factory, ai_config) for _ in range(repeat)]
+            result = min(runs, key=lambda run: run["time"])
+            if memory:
+                result["peak_memory"] = measure_memory(factory, ai_config)
+            config_results[position_name] = result
+
+        times = [result["time"] for result in config_results.values()]
+        nodes = sum(result["nodes"] for result in config_results.values())
+        summary = {
+            "nodes_per_s": nodes / sum(times),
+            "time_total": sum(times),
+            "time_p50": percentile(times, 50),
+            "time_p90": percentile(times, 90),
+            "time_max": max(times),
+        }
+        if memory:
+            summary["peak_memory"] = max(
+                result["peak_memory"] for result in config_results.values()
+            )
+        results[config_name] = {"summary": summary, "positions": config_results}
+    return results
+
+
+def print_results(results: dict):
+    for config_name, config_results in results.items():
+        summary = config_results["summary"]
+        line = (
+            f"{config_name}: {summary['nodes_per_s']:.0f} nodes/s, "
+            f"p50 {summary['time_p50']:.3f}s, p90 {summary['time_p90']:.3f}s, "
+            f"max {summary['time_max']:.3f}s"
+        )
+        if "peak_memory" in summary:
+            line += f", peak memory {summary['peak_memory'] / 2**20:.1f}MiB"
+        print(line)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Compare the results to the baseline, and return the regressions."""
+    regressions = []
+    for config_name, config_results in results.items():
+        if config_name not in baseline:
+            continue
+        base = baseline[config_name]
+
+        for position_name, result in config_results["positions"].items():
+            base_result = base["positions"].get(position_name)
+            if base_result is not None and result["moves"] != base_result["moves"]:
+                regressions.append(
+                    f"{config_name} {position_name}: moves changed from "
+                    f"{base_result['moves']} to {result['moves']}"
+                )
+
+        summary = config_results["summary"]
+        base_summary = base["summary"]
+        for key in ("time_total", "time_p50", "time_p90", "time_max", "peak_memory"):
+            if key not in summary or key not in base_summary:
+                continue
+            slack = TIME_SLACK if key.startswith("time") else 0
+            if summary[key] > base_summary[key] * (1 + tolerance) + slack:
+                regressions.append(
+                    f"{config_name}: {key} went from {base_summary[key]:g} "
+                    f"to {summary[key]:g}"
+                )
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="crapette.benchmark", description="Benchmark the AI search"
+    )
+    parser.add_argument(
+        "-n", "--deals", type=int, default=5, help="Number of seeded deals."
+    )
+    parser.add_argument(
+        "-t",
+        "--turns",
+        type=int,
+        default=12,
+        help="Number of turns played on the deals before the benchmark.",
+    )
+    parser.add_argument(
+        "-s", "--seed", type=int, default=0, help="Seed of the first deal."
+    )
+    parser.add_argument(
+        "--snapshots",
+        type=Path,
+        nargs="+",
+        default=[],
+        help="Benchmark the boards of these snapshot files instead of the default corpus.",
+    )
+    parser.add_argument(
+        "--save-snapshots",
+        type=Path,
+        help="Save the boards of the default corpus to this snapshot file.",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=1,
+        help="Number of runs per search, the fastest one is kept.",
+    )
+    parser.add_argument(
+        "--engine", choices=ENGINES, default="python", help="AI engine."
+    )
+    parser.add_argument(
+        "--memory",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Measure the peak memory, with an additional run per search.",
+    )
+    parser.add_argument("--save", type=Path, help="Save the results to this JSON file.")
+    parser.add_argument(
+        "--baseline", type=Path, help="Compare the results to this JSON file."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Relative slowdown or memory increase accepted against the baseline.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.snapshots:
+        positions = snapshots_corpus(args.snapshots)
+    else:
+        positions = corpus(args.deals, args.seed, args.turns)
+        if args.save_snapshots:
+            save_snapshots(
+                args.save_snapshots, [factory() for factory in positions.values()]
+            )
+
+    results = run_benchmark(
+        positions,
+        brain_configs(args.engine),
+        args.repeat,
+        args.memory,
+    )
+    print_results(results)
+
+    if args.save:
+        with args.save.open("w", encoding="utf8") as f:
+            json.dump(results, f, indent=1)
+
+    if args.baseline:
+        with args.baseline.open(encoding="utf8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regressions:", *regressions, sep="\n  ")
+            sys.exit(1)
+        print("No regression")
+
+
+if __name__ == "__main__":
+    main()
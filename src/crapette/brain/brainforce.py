@@ -1,17 +1,16 @@
 """IA for playing the crapette."""
 
-import dataclasses
+import contextlib
 import heapq
 import sys
 import timeit
+from collections.abc import Callable
+from pathlib import Path
 from typing import TYPE_CHECKING
 
-from kivy.app import App
-from kivy.logger import Logger
-from line_profiler import profile
-
 from crapette.core.board import Board, HashBoard
 from crapette.core.cards import Card
+from crapette.core.logger import Logger
 from crapette.core.moves import Flip, FlipWaste, Move
 from crapette.core.piles import (
     CrapePile,
@@ -22,9 +21,15 @@ from crapette.core.piles import (
     WastePile,
     _PlayerPile,
 )
+from crapette.profiling import profile
+
+from .config import BrainConfig, SearchCancelledError
+from .positions import open_database
+from .telemetry import SearchStats
+from .trace import TraceWriter
 
 if TYPE_CHECKING:
-    from crapette.game_manager import GameConfig
+    from crapette.core.game_config import GameConfig
 
 sys.setrecursionlimit(10**5)
 
@@ -33,30 +38,40 @@ sys.setrecursionlimit(10**5)
 #     sys.stdout = open(1, "w", encoding="utf-8", closefd=False)  # fd 1 is stdout
 
 
-class AIError(RuntimeError):
-    pass
-
-
-@dataclasses.dataclass
-class BrainConfig:
-    shortcut: bool = True
-    filter_piles_orig: bool = True
-    filter_piles_orig_aggressive: bool = True
-    mono: bool = True
-    print_progress: bool = False
-    reproducible: bool = True
-
-
 class BrainForce:
-    def __init__(self, game_config: "GameConfig"):
+    def __init__(
+        self,
+        game_config: "GameConfig",
+        ai_config: BrainConfig,
+        is_cancelled: Callable[[], bool] | None = None,
+    ):
         self.game_config = game_config
+        self.ai_config = ai_config
+        self.is_cancelled = is_cancelled
+        self.stats: SearchStats | None = None
+
+    @property
+    def nb_nodes_visited(self) -> int:
+        return 0 if self.stats is None else self.stats.nodes_expanded
 
     def compute_states(self):
         Logger.debug("*" * 50)
         Logger.debug("compute_states for player %s", self.game_config.active_player)
 
         start_time = timeit.default_timer()
-        moves, nb_nodes_visited = BrainDijkstra(self.game_config).compute_search()
+        database = (
+            open_database(self.ai_config.position_db)
+            if self.ai_config.position_db
+            else None
+        )
+        if database is not None:
+            solved = database.get(self.game_config, self.ai_config)
+            if solved is not None:
+                return self._database_hit(solved.moves, start_time)
+
+        brain = BrainDijkstra(self.game_config, self.ai_config, self.is_cancelled)
+        self.stats = brain.stats
+        moves, nb_nodes_visited = brain.compute_search()
 
         if not moves:
             player_piles = self.game_config.board.players_piles[
@@ -74,7 +89,14 @@ class BrainForce:
                 moves = [Move(stock.top_card, stock, player_piles.waste)]
             # TODO: manage the case of an empty stock and non-empty crape
 
+        if database is not None:
+            database.put(self.game_config, self.ai_config, moves, brain.best_score)
+
         elapsed = timeit.default_timer() - start_time
+        self.stats.time = elapsed
+        self.stats.nb_moves = len(moves)
+        if self.ai_config.stats_path:
+            self.stats.append_jsonl(Path(self.ai_config.stats_path))
         Logger.info(
             "AI time #%d: %gs for %d possibilities (%.3fms each on avearge)",
             self.game_config.step,
@@ -82,7 +104,23 @@ class BrainForce:
             nb_nodes_visited,
             elapsed / nb_nodes_visited * 1000,
         )
-        print(flush=True)
+        return moves
+
+    def _database_hit(self, moves: list, start_time: float) -> list:
+        self.stats = SearchStats(
+            step=self.game_config.step,
+            player=self.game_config.active_player,
+            termination="database",
+            nb_moves=len(moves),
+            time=timeit.default_timer() - start_time,
+        )
+        if self.ai_config.stats_path:
+            self.stats.append_jsonl(Path(self.ai_config.stats_path))
+        Logger.info(
+            "AI time #%d: %gs, found in the position database",
+            self.game_config.step,
+            self.stats.time,
+        )
         return moves
 
 
@@ -97,6 +135,7 @@ class BoardNode:
         "visited",
         "moves",
         "index",
+        "parent",
     ]
 
     def __init__(self, board: HashBoard, player: int, ai_config) -> None:
@@ -109,6 +148,8 @@ class BoardNode:
         self.score_min = tuple(-s for s in self.score)
         self.visited: bool = False
         self.moves: list[Move] = []
+        self.index = 0
+        self.parent = 0  # Index of the node from which this one was found
 
     def __lt__(self, other):
         """Compute the node cost.
@@ -126,19 +167,21 @@ class BoardNode:
         self,
         known_nodes: dict[HashBoard, "BoardNode"],
         known_nodes_unvisited: list["BoardNode"],  # Actually a heapq
-    ):
+    ) -> int:
+        """Register the boards reachable in one move, and return their number."""
         # This one was searched
         # Note: already popped from known_nodes_unvisited
         self.visited = True
 
         # If last move was from a player pile, stop here
         if self.moves and isinstance(self.moves[-1].origin, _PlayerPile):
-            return
+            return 0
 
         foundation_dest, tableau_dest, opponent_dest = self.piles_dest()
         piles_dest = foundation_dest + tableau_dest + opponent_dest
         piles_orig = self.piles_orig(foundation_dest, tableau_dest, opponent_dest)
 
+        nb_generated = 0
         # Check all possible origin piles
         for pile_orig in piles_orig:
             card = pile_orig.top_card
@@ -178,6 +221,8 @@ class BoardNode:
                 self.register_next_board(
                     Move(card, pile_orig, pile_dest), known_nodes, known_nodes_unvisited
                 )
+                nb_generated += 1
+        return nb_generated
 
     @profile
     def register_next_board(self, move: Move, known_nodes, known_nodes_unvisited):
@@ -202,6 +247,7 @@ class BoardNode:
         next_board_node = BoardNode(next_board, self.player, self.ai_config)
         next_board_node.moves = [*self.moves, move]
         next_board_node.cost = cost
+        next_board_node.parent = self.index
         known_nodes[next_board] = next_board_node
         heapq.heappush(known_nodes_unvisited, next_board_node)
 
@@ -334,15 +380,26 @@ class BoardNode:
 
 
 class BrainDijkstra:
-    def __init__(self, game_config: "GameConfig") -> None:
+    # Number of visited nodes between two checks of is_cancelled
+    CANCEL_CHECK_PERIOD = 256
+
+    def __init__(
+        self,
+        game_config: "GameConfig",
+        ai_config: BrainConfig,
+        is_cancelled: Callable[[], bool] | None = None,
+    ) -> None:
         self.game_config = game_config
-        self.app_config = App.get_running_app().app_config
+        self.ai_config = ai_config
+        self.is_cancelled = is_cancelled
+        self.stats = SearchStats(
+            step=game_config.step, player=game_config.active_player
+        )
+        self.best_score = BoardScore.WORSE
         hash_board = HashBoard(self.game_config.board)
 
         # Initialize
-        first_node = BoardNode(
-            hash_board, self.game_config.active_player, self.app_config.ai
-        )
+        first_node = BoardNode(hash_board, self.game_config.active_player, ai_config)
         self.known_nodes = {hash_board: first_node}
         self.known_nodes_unvisited = []
         heapq.heappush(self.known_nodes_unvisited, first_node)
@@ -350,45 +407,78 @@ class BrainDijkstra:
     def _select_next_node(self) -> BoardNode | None:
         try:
             while (board_node := heapq.heappop(self.known_nodes_unvisited)).visited:
-                pass
+                self.stats.stale_pops += 1
         except IndexError:
             return None
         else:
             return board_node
 
     @profile
-    def compute_search(self):
+    def compute_search(self):  # noqa: PLR0912
         max_score = BoardScore.WORSE
         best_node = None
 
-        path = self.game_config.log_path.with_suffix("")
-        path.mkdir(parents=True, exist_ok=True)
-        path = path / f"log_{self.game_config.step:04d}.txt"
-
         # Optimize using local vars out of `while`
-        do_shortcut = self.app_config.ai.shortcut
-        print_progress = self.app_config.ai.print_progress
+        do_shortcut = self.ai_config.shortcut
+        print_progress = self.ai_config.print_progress
+        is_cancelled = self.is_cancelled
         known_nodes = self.known_nodes
         known_nodes_unvisited = self.known_nodes_unvisited
+        stats = self.stats
+        stats.termination = "exhausted"
 
         nb_nodes_visited = 0
-        with path.open("w", encoding="utf8") as f:
+        # No file is written unless the trace is enabled
+        with (
+            TraceWriter(
+                self.game_config.log_path.with_suffix("")
+                / f"trace_{self.game_config.step:04d}.bin",
+                self.game_config.step,
+                self.game_config.active_player,
+            )
+            if self.ai_config.trace
+            else contextlib.nullcontext()
+        ) as trace:
             while (next_node := self._select_next_node()) is not None:
                 nb_nodes_visited += 1
-                next_node.search_neighbors(known_nodes, known_nodes_unvisited)
+                if (
+                    is_cancelled is not None
+                    and nb_nodes_visited % self.CANCEL_CHECK_PERIOD == 0
+                    and is_cancelled()
+                ):
+                    stats.termination = "cancelled"
+                    raise SearchCancelledError(
+                        f"Search cancelled after {nb_nodes_visited} nodes"
+                    )
                 next_node.index = nb_nodes_visited
+                nb_known_nodes = len(known_nodes)
+                nb_generated = next_node.search_neighbors(
+                    known_nodes, known_nodes_unvisited
+                )
+                stats.count_expansion(
+                    len(next_node.moves),
+                    nb_generated,
+                    len(known_nodes) - nb_known_nodes,
+                )
+                stats.max_frontier = max(stats.max_frontier, len(known_nodes_unvisited))
                 if next_node.score > max_score:
                     max_score = next_node.score
                     best_node = next_node
 
-                if print_progress:
-                    # print(next_node.board.to_text())
-                    f.write(f"{nb_nodes_visited}\n")
-                    f.write(next_node.board.to_text())
-                    f.write(
-                        f"\n{len(known_nodes)} known nodes\n{len(known_nodes_unvisited)} unvisited\n\n***\n\n"
+                if trace is not None:
+                    trace.write_node(
+                        next_node.index,
+                        next_node.parent,
+                        (
+                            next_node.board.encode_move(next_node.moves[-1])
+                            if next_node.moves
+                            else ()
+                        ),
+                        next_node.score,
+                        next_node.board,
                     )
 
+                if print_progress:
                     print(
                         f"#{nb_nodes_visited}: {len(known_nodes)} known nodes, {len(known_nodes_unvisited)} unvisited, {len(next_node.moves)} moves (best: #{best_node.index}, {len(best_node.moves)} moves)",
                         end="\r",
@@ -403,12 +493,13 @@ class BrainDijkstra:
                         ):
                             break  # Break out of shortcut check loop
                     else:
+                        stats.termination = "shortcut"
                         break  # Break out of main loop if shortcut found
 
             if print_progress:
                 print(" " * 80, end="\r")
 
-            # Shortcut from app_config.ai.shortcut
+            # Shortcut from ai_config.shortcut
             if known_nodes_unvisited:
                 moves = [best_node.moves[0]]
                 for index, move in enumerate(best_node.moves[1:]):
@@ -421,15 +512,14 @@ class BrainDijkstra:
                         moves.append(move)
                     else:
                         break
-                print("shortcut:", len(moves))
-                f.write(f"shortcut: {len(moves)}\n")
+                stats.shortcut_length = len(moves)
+                Logger.debug("shortcut: %d", len(moves))
             else:
                 moves = best_node.moves
 
-            f.write("\n")
-            f.write("\n".join(str(move) for move in moves))
-            f.write("\n\n")
+            Logger.debug("moves: %s", moves)
 
+        self.best_score = max_score
         return moves, nb_nodes_visited
 
 
@@ -0,0 +1,164 @@
+"""IA for playing the crapette, using the Rust implementation."""
+
+import timeit
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from crapette import rust_brain
+from crapette.core.board import Board
+from crapette.core.logger import Logger
+from crapette.core.moves import Flip, FlipWaste, Move
+
+from .brainforce import BrainForce
+from .config import AIError, BrainConfig
+
+if TYPE_CHECKING:
+    from crapette.core.game_config import GameConfig
+
+
+def moves_from_rust(board: Board, rust_moves: list[tuple]) -> list:
+    """Convert the moves computed by `rust_brain.compute` to Python moves.
+
+    Each Rust move is a (kind, card, origin, destination) tuple, where card is a
+    (rank, suit, player) tuple and piles are (kind, index) tuples.
+    The cards and piles are mapped back to the ones in the board.
+    """
+    cards = {(c.rank, c.suit, c.player): c for pile in board.piles for c in pile}
+
+    def pile_from_rust(rust_pile):
+        kind, index = rust_pile
+        if kind == "foundation":
+            return board.foundation_piles[index]
+        if kind == "tableau":
+            return board.tableau_piles[index]
+        return getattr(board.players_piles[index], kind)
+
+    moves = []
+    for kind, card, origin, destination in rust_moves:
+        if kind == "move":
+            moves.append(
+                Move(cards[card], pile_from_rust(origin), pile_from_rust(destination))
+            )
+        elif kind == "flip":
+            moves.append(Flip(cards[card], pile_from_rust(origin)))
+        elif kind == "flip_waste":
+            moves.append(FlipWaste())
+        else:
+            raise AIError(f"Unknown move from Rust: {kind}")
+    return moves
+
+
+def move_key(move: Move | Flip | FlipWaste) -> tuple:
+    """Board independent representation of a move, to compare moves."""
+    if isinstance(move, Move):
+        return (
+            "move",
+            move.card.str_rank_suit,
+            move.origin.name,
+            move.destination.name,
+        )
+    if isinstance(move, Flip):
+        return ("flip", move.pile.name)
+    return ("flip_waste",)
+
+
+class RustSearch:
+    """Handle on a Rust search running in a background thread.
+
+    The Rust search doesn't hold the GIL, so the caller is free to continue its work.
+    """
+
+    def __init__(self, board: Board, handle):
+        self.board = board
+        self._handle = handle
+
+    def done(self) -> bool:
+        """Check if the search is finished, without blocking."""
+        return self._handle.done()
+
+    def cancel(self):
+        """Ask the search to stop as soon as possible."""
+        self._handle.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._handle.cancelled
+
+    def result(self) -> list | None:
+        """Wait for the end of the search and return the moves, or None if cancelled."""
+        rust_moves = self._handle.result()
+        if rust_moves is None:
+            return None
+        return moves_from_rust(self.board, rust_moves)
+
+
+class BrainRust:
+    def __init__(self, game_config: "GameConfig", ai_config: BrainConfig):
+        self.game_config = game_config
+        self.ai_config = ai_config
+
+    def start_search(self) -> RustSearch:
+        """Start the search in a background thread and return immediately."""
+        Logger.debug(
+            "Rust search started for player %s", self.game_config.active_player
+        )
+        handle = rust_brain.spawn_compute(
+            self.game_config.board.to_bytes(),
+            self.game_config.active_player,
+            self.game_config.crapette_mode,
+            "",
+        )
+        return RustSearch(self.game_config.board, handle)
+
+    def compute_states(self):
+        Logger.debug("*" * 50)
+        Logger.debug(
+            "Rust compute_states for player %s", self.game_config.active_player
+        )
+
+        start_time = timeit.default_timer()
+        rust_moves = rust_brain.compute(
+            self.game_config.board.to_bytes(),
+            self.game_config.active_player,
+            self.game_config.crapette_mode,
+            "",
+        )
+        moves = moves_from_rust(self.game_config.board, rust_moves)
+
+        elapsed = timeit.default_timer() - start_time
+        Logger.info("Rust AI time #%d: %gs", self.game_config.step, elapsed)
+        return moves
+
+
+class BrainBoth:
+    """Run both the Python and the Rust AI and log the differences.
+
+    The moves from the Python AI are played.
+    """
+
+    def __init__(
+        self,
+        game_config: "GameConfig",
+        ai_config: BrainConfig,
+        is_cancelled: Callable[[], bool] | None = None,
+    ):
+        self.game_config = game_config
+        self.ai_config = ai_config
+        self.is_cancelled = is_cancelled
+
+    def compute_states(self):
+        moves = BrainForce(
+            self.game_config, self.ai_config, self.is_cancelled
+        ).compute_states()
+        rust_moves = BrainRust(self.game_config, self.ai_config).compute_states()
+
+        keys = [move_key(move) for move in moves]
+        rust_keys = [move_key(move) for move in rust_moves]
+        if keys != rust_keys:
+            Logger.info(
+                "AI engines differ #%d:\n  python: %s\n  rust:   %s",
+                self.game_config.step,
+                keys,
+                rust_keys,
+            )
+        return moves
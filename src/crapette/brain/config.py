@@ -0,0 +1,69 @@
+"""Configuration and errors of the AI, without importing the search.
+
+The GUI uses them at startup, before any AI search, see `crapette.game_manager`.
+"""
+
+import argparse
+import dataclasses
+
+
+class AIError(RuntimeError):
+    pass
+
+
+class SearchCancelledError(Exception):
+    """The search was stopped before the end, see `BrainDijkstra.is_cancelled`."""
+
+
+ENGINES = ("python", "rust", "both")
+
+
+@dataclasses.dataclass
+class BrainConfig:
+    engine: str = dataclasses.field(default="python", metadata={"choices": ENGINES})
+    shortcut: bool = True
+    filter_piles_orig: bool = True
+    filter_piles_orig_aggressive: bool = True
+    mono: bool = True
+    ponder: bool = False
+    print_progress: bool = False
+    reproducible: bool = True
+    # Binary trace of the visited nodes, see `crapette.brain.trace`
+    trace: bool = False
+    # JSON lines file where the `SearchStats` of each search are appended
+    stats_path: str = ""
+    # SQLite database of the solved positions, see `crapette.brain.positions`
+    position_db: str = ""
+
+
+def add_brain_arguments(parser: argparse.ArgumentParser):
+    """Add an option to the command line parser for each `BrainConfig` field."""
+    ai_group = parser.add_argument_group("AI", "Options to control the AI behavior.")
+    for field in dataclasses.fields(BrainConfig):
+        name_cli = field.name.replace("_", "-")
+        if field.type is bool:
+            ai_group.add_argument(
+                f"--{name_cli}",
+                action=argparse.BooleanOptionalAction,
+                default=field.default,
+                help=name_cli,
+            )
+        elif field.type is str:
+            ai_group.add_argument(
+                f"--{name_cli}",
+                choices=field.metadata.get("choices"),
+                default=field.default,
+                help=name_cli,
+            )
+        else:
+            raise ValueError(f"Unknown field type {field.type} for {field.name}")
+
+
+def brain_config_from_args(args: argparse.Namespace) -> BrainConfig:
+    """Create the `BrainConfig` from the options added by `add_brain_arguments`."""
+    return BrainConfig(
+        **{
+            field.name: getattr(args, field.name)
+            for field in dataclasses.fields(BrainConfig)
+        }
+    )
@@ -0,0 +1,32 @@
+"""Selection of the AI engine, see `BrainConfig.engine`."""
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from .brainforce import BrainForce
+from .config import BrainConfig
+
+if TYPE_CHECKING:
+    from crapette.core.game_config import GameConfig
+
+
+def new_brain(
+    game_config: "GameConfig",
+    ai_config: BrainConfig,
+    is_cancelled: Callable[[], bool] | None = None,
+):
+    """Instantiate the AI for the engine selected in the configuration.
+
+    `is_cancelled` is only used by the Python engine.
+    """
+    if ai_config.engine == "python":
+        return BrainForce(game_config, ai_config, is_cancelled)
+
+    # The Rust extension is only imported when needed, it may not be compiled
+    from .brainrust import BrainBoth, BrainRust  # noqa: PLC0415
+
+    if ai_config.engine == "rust":
+        return BrainRust(game_config, ai_config)
+    if ai_config.engine == "both":
+        return BrainBoth(game_config, ai_config, is_cancelled)
+    raise ValueError(f"Unknown AI engine {ai_config.engine}")
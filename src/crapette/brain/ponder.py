@@ -0,0 +1,88 @@
+"""Speculative AI searches during the turn of a human player."""
+
+import collections
+import concurrent.futures
+
+from crapette.core.board import Board
+from crapette.core.game_config import GameConfig
+
+from .config import BrainConfig
+from .positions import position_key
+from .worker import AIWorker
+
+
+def expected_position(game_config: GameConfig) -> GameConfig | None:
+    """Position expected at the start of the next turn.
+
+    The turn of the active player is expected to end by putting the top card of
+    their stock on their waste. Returns None if it's not possible.
+    """
+    player = game_config.active_player
+    board = Board.from_bytes(game_config.board.to_bytes())
+    player_piles = board.players_piles[player]
+    if player_piles.stock.is_empty:
+        return None
+
+    card = player_piles.stock.pop_card()
+    card.face_up = True
+    player_piles.waste.add_card(card)
+
+    expected = GameConfig(
+        player_types=game_config.player_types,
+        active_player=1 - player,
+        step=game_config.step + 1,
+        log_path=game_config.log_path,
+        board=board,
+    )
+    board.set_game_config(expected)
+    return expected
+
+
+class Ponderer:
+    """Precompute the AI moves for the expected positions of the next AI turn.
+
+    The searches run on the AI worker, so a real request makes the pondering stale.
+    The results are cached by `position_key`.
+    """
+
+    MAX_CACHE_SIZE = 32
+
+    def __init__(self, worker: AIWorker):
+        self.worker = worker
+        self._cache: collections.OrderedDict[bytes, concurrent.futures.Future] = (
+            collections.OrderedDict()
+        )
+
+    def ponder(self, game_config: GameConfig, ai_config: BrainConfig):
+        """Start a search for the position expected after the current turn."""
+        expected = expected_position(game_config)
+        if expected is None:
+            return
+        key = position_key(expected)
+        if self.lookup(expected) is not None:
+            return
+
+        self._cache[key] = self.worker.submit(expected, ai_config)
+        while len(self._cache) > self.MAX_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def lookup(self, game_config: GameConfig) -> concurrent.futures.Future | None:
+        """Return the future of the search for this exact position, if any.
+
+        The future may still be running, but only if it is not stale.
+        """
+        key = position_key(game_config)
+        future = self._cache.get(key)
+        if future is None:
+            return None
+        if future.done():
+            if not future.cancelled() and future.exception() is None:
+                return future
+        elif self.worker.is_current(future):
+            return future
+        # Stale or failed search
+        del self._cache[key]
+        return None
+
+    def clear(self):
+        self._cache.clear()
@@ -0,0 +1,129 @@
+"""On disk database of the positions already solved by the AI.
+
+Many positions come back between games, or between runs of the simulations and
+benchmarks. The moves found by the AI are stored in a SQLite database, see
+`BrainConfig.position_db`, keyed by the position and the search flags.
+"""
+
+import dataclasses
+import json
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from crapette.core.moves import Flip, FlipWaste, Move
+
+if TYPE_CHECKING:
+    from crapette.core.game_config import GameConfig
+
+    from .config import BrainConfig
+
+# `BrainConfig` flags changing the moves found by the search
+RESULT_FLAGS = (
+    "shortcut",
+    "filter_piles_orig",
+    "filter_piles_orig_aggressive",
+    "reproducible",
+)
+
+
+def position_key(game_config: "GameConfig") -> bytes:
+    """Key identifying exactly a position for the AI: the active player and the board."""
+    return bytes((game_config.active_player,)) + game_config.board.to_bytes()
+
+
+def config_key(ai_config: "BrainConfig") -> str:
+    return ",".join(f"{flag}={int(getattr(ai_config, flag))}" for flag in RESULT_FLAGS)
+
+
+@dataclasses.dataclass
+class SolvedPosition:
+    moves: list[Move | Flip | FlipWaste]
+    score: tuple[int, ...]
+    config: str
+
+
+class PositionDatabase:
+    """Moves found by the AI, by position and search flags.
+
+    The database may be shared by several threads and processes.
+    """
+
+    TIMEOUT = 10  # s, waiting for another process to write
+
+    def __init__(self, path: Path):
+        # Only imported when the database is enabled, see `BrainConfig.position_db`
+        import sqlite3  # noqa: PLC0415
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            path, timeout=self.TIMEOUT, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        # Faster commits, still safe with several processes
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS positions ("
+                "position BLOB, config TEXT, moves TEXT, score TEXT, "
+                "PRIMARY KEY (position, config))"
+            )
+
+    def get(
+        self, game_config: "GameConfig", ai_config: "BrainConfig"
+    ) -> SolvedPosition | None:
+        """Return the moves stored for this position, using the cards and piles of its board."""
+        config = config_key(ai_config)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT moves, score FROM positions WHERE position = ? AND config = ?",
+                (position_key(game_config), config),
+            ).fetchone()
+        if row is None:
+            return None
+        moves, score = row
+        return SolvedPosition(
+            moves=game_config.board.decode_moves(json.loads(moves)),
+            score=tuple(json.loads(score)),
+            config=config,
+        )
+
+    def put(
+        self,
+        game_config: "GameConfig",
+        ai_config: "BrainConfig",
+        moves: list[Move | Flip | FlipWaste],
+        score: tuple[int, ...],
+    ):
+        board = game_config.board
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO positions VALUES (?, ?, ?, ?)",
+                (
+                    position_key(game_config),
+                    config_key(ai_config),
+                    json.dumps([board.encode_move(move) for move in moves]),
+                    json.dumps(score),
+                ),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM positions"
+            ).fetchone()[0]
+
+    def close(self):
+        self._connection.close()
+
+
+_databases: dict[str, PositionDatabase] = {}
+
+
+def open_database(path: str) -> PositionDatabase:
+    """Return the database of this path, opened once per process."""
+    database = _databases.get(path)
+    if database is None:
+        database = _databases[path] = PositionDatabase(Path(path))
+    return database
@@ -0,0 +1,64 @@
+"""Statistics collected during an AI search."""
+
+import dataclasses
+import json
+from pathlib import Path
+
+
+@dataclasses.dataclass
+class SearchStats:
+    """Telemetry of one search, filled by `BrainDijkstra.compute_search`."""
+
+    step: int = 0
+    player: int = 0
+    # Nodes popped from the heap and searched for neighbors
+    nodes_expanded: int = 0
+    # Boards created from the expanded nodes, including the already known ones
+    nodes_generated: int = 0
+    # Generated boards which were already known
+    duplicate_hits: int = 0
+    # Heap pops of nodes already visited or replaced by a cheaper one
+    stale_pops: int = 0
+    # Maximum heap size, including the stale nodes
+    max_frontier: int = 0
+    # "exhausted", "shortcut", "cancelled" or "database" (no search)
+    termination: str = ""
+    # Number of expanded nodes and generated boards, by depth (number of moves)
+    expanded_per_depth: list[int] = dataclasses.field(default_factory=list)
+    generated_per_depth: list[int] = dataclasses.field(default_factory=list)
+    # Number of moves played before the next search, see `BrainConfig.shortcut`
+    shortcut_length: int = 0
+    nb_moves: int = 0
+    time: float = 0  # s
+
+    def count_expansion(self, depth: int, nb_generated: int, nb_new: int):
+        """Register the expansion of a node."""
+        self.nodes_expanded += 1
+        self.nodes_generated += nb_generated
+        self.duplicate_hits += nb_generated - nb_new
+        while depth >= len(self.expanded_per_depth):
+            self.expanded_per_depth.append(0)
+            self.generated_per_depth.append(0)
+        self.expanded_per_depth[depth] += 1
+        self.generated_per_depth[depth] += nb_generated
+
+    @property
+    def branching_factors(self) -> list[float]:
+        """Average number of generated boards per expanded node, by depth."""
+        return [
+            generated / expanded if expanded else 0
+            for expanded, generated in zip(
+                self.expanded_per_depth, self.generated_per_depth, strict=True
+            )
+        ]
+
+    def to_dict(self) -> dict:
+        return {
+            **dataclasses.asdict(self),
+            "branching_factors": self.branching_factors,
+        }
+
+    def append_jsonl(self, path: Path):
+        """Append the statistics as a JSON line to the file."""
+        with path.open("a", encoding="utf8") as f:
+            f.write(json.dumps(self.to_dict()) + "\n")
@@ -0,0 +1,151 @@
+"""Compact binary trace of the AI search, and its offline rendering.
+
+The trace of a search is written by `BrainDijkstra.compute_search` if
+`BrainConfig.trace` is set. The file starts with a header, followed by one
+record per visited node: its index, the index of its parent node (0 for the
+first node), the last move encoded with `Board.encode_move` (padded with 255),
+the score, and the board encoded with `Board.to_bytes`.
+
+Render nodes of a trace as text with:
+
+    python -m crapette.brain.trace TRACE_FILE [NODE_INDEX ...] [--path]
+"""
+
+import argparse
+import dataclasses
+import struct
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+from crapette.core.board import Board
+from crapette.core.game_config import GameConfig
+
+MAGIC = b"CRTR"
+VERSION = 1
+HEADER = struct.Struct("<4sBHB")  # magic, version, step, player
+RECORD = struct.Struct("<II3B12hH")  # index, parent, move, score, board size
+NO_MOVE = 255
+BUFFER_SIZE = 2**20  # bytes
+
+
+@dataclasses.dataclass
+class TraceNode:
+    index: int
+    parent: int
+    move: tuple[int, ...]
+    score: tuple[int, ...]
+    board: bytes
+
+
+class TraceWriter:
+    """Buffered writer of a search trace."""
+
+    def __init__(self, path: Path, step: int, player: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("wb", buffering=BUFFER_SIZE)
+        self._file.write(HEADER.pack(MAGIC, VERSION, step, player))
+
+    def write_node(
+        self,
+        index: int,
+        parent: int,
+        move: tuple[int, ...],
+        score: tuple[int, ...],
+        board: Board,
+    ):
+        board_bytes = board.to_bytes()
+        move = (*move, *(NO_MOVE,) * (3 - len(move)))
+        self._file.write(RECORD.pack(index, parent, *move, *score, len(board_bytes)))
+        self._file.write(board_bytes)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.close()
+
+
+def read_trace(path: Path) -> tuple[int, int, Iterator[TraceNode]]:
+    """Read a trace file, and return the step, the player and the nodes."""
+    data = path.read_bytes()
+    magic, version, step, player = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a search trace")
+    if version != VERSION:
+        raise ValueError(f"Unsupported trace version {version} in {path}")
+
+    def nodes():
+        offset = HEADER.size
+        while offset < len(data):
+            index, parent, *values = RECORD.unpack_from(data, offset)
+            offset += RECORD.size
+            move = tuple(v for v in values[:3] if v != NO_MOVE)
+            score = tuple(values[3:-1])
+            board_size = values[-1]
+            yield TraceNode(
+                index, parent, move, score, data[offset : offset + board_size]
+            )
+            offset += board_size
+
+    return step, player, nodes()
+
+
+def render_node(node: TraceNode, player: int) -> str:
+    board = Board.from_bytes(node.board)
+    board.set_game_config(GameConfig(active_player=player))
+    move = board.decode_moves([node.move])[0] if node.move else None
+    return "\n".join(
+        [
+            f"#{node.index} (parent #{node.parent}), score {node.score}",
+            f"last move: {move}",
+            board.to_text(),
+        ]
+    )
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="crapette.brain.trace", description="Render nodes of an AI search trace"
+    )
+    parser.add_argument("trace", type=Path, help="Trace file.")
+    parser.add_argument(
+        "nodes",
+        type=int,
+        nargs="*",
+        help="Indexes of the nodes to render, all nodes are summarized if none.",
+    )
+    parser.add_argument(
+        "--path",
+        action="store_true",
+        help="Also render the nodes leading to the selected nodes.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    step, player, nodes = read_trace(args.trace)
+    nodes = {node.index: node for node in nodes}
+    print(f"Step {step}, player {player}, {len(nodes)} nodes")
+
+    if not args.nodes:
+        for node in nodes.values():
+            print(f"#{node.index} (parent #{node.parent}) {node.move} {node.score}")
+        return
+
+    for index in args.nodes:
+        selected = [nodes[index]]
+        if args.path:
+            while selected[0].parent:
+                selected.insert(0, nodes[selected[0].parent])
+        for node in selected:
+            print(render_node(node, player))
+            print()
+
+
+if __name__ == "__main__":
+    main()
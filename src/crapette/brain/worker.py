@@ -0,0 +1,145 @@
+"""Background worker computing the AI moves.
+
+The requests and responses only contain plain data (the board is encoded with
+`Board.to_bytes` and the moves with `Board.encode_move`), so that the worker can
+run in a thread or in a separate process.
+"""
+
+import concurrent.futures
+import dataclasses
+import multiprocessing
+from pathlib import Path
+
+from crapette.core.board import Board
+from crapette.core.game_config import GameConfig
+
+from .config import BrainConfig
+from .engines import new_brain
+
+# Id of the request that the worker should be computing, shared with the main process.
+# Any other running request is stale and stops as soon as possible.
+_current_request_id = None
+
+
+def _init_worker(current_request_id):
+    global _current_request_id  # noqa: PLW0603
+    _current_request_id = current_request_id
+
+
+@dataclasses.dataclass(frozen=True)
+class AIRequest:
+    request_id: int
+    board: bytes
+    active_player: int
+    step: int
+    crapette_mode: bool
+    ai_config: BrainConfig
+    log_path: Path  # Of the game, for the AI trace files
+
+
+@dataclasses.dataclass(frozen=True)
+class AIResponse:
+    request_id: int
+    moves: list[tuple[int, ...]]
+
+
+def solve(request: AIRequest) -> AIResponse:
+    """Compute the moves for a request, this is run in the worker.
+
+    Raises `SearchCancelledError` if the request became stale during the search.
+    """
+    game_config = GameConfig(
+        active_player=request.active_player,
+        step=request.step,
+        crapette_mode=request.crapette_mode,
+        log_path=request.log_path,
+        board=Board.from_bytes(request.board),
+    )
+    game_config.board.set_game_config(game_config)
+
+    def is_cancelled():
+        return _current_request_id.value != request.request_id
+
+    moves = new_brain(game_config, request.ai_config, is_cancelled).compute_states()
+    return AIResponse(
+        request.request_id, [game_config.board.encode_move(move) for move in moves]
+    )
+
+
+class AIWorker:
+    """Persistent worker computing the AI moves in the background.
+
+    The worker (a thread or a process) is started on the first request and reused
+    for the next ones. There is at most one active request at a time, submitting
+    a new one or calling `cancel` makes the previous one stale.
+    """
+
+    def __init__(self, use_process: bool = True):
+        self.use_process = use_process
+        self._executor: concurrent.futures.Executor | None = None
+        self._current_request_id = None
+        self._future: concurrent.futures.Future | None = None
+        self._last_request_id = 0
+
+    def _start(self):
+        if self.use_process:
+            # Spawn rather than fork, the GUI process state must not be copied
+            context = multiprocessing.get_context("spawn")
+            self._current_request_id = context.Value("q", 0)
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self._current_request_id,),
+            )
+        else:
+            self._current_request_id = multiprocessing.Value("q", 0)
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="AIWorker",
+                initializer=_init_worker,
+                initargs=(self._current_request_id,),
+            )
+
+    def submit(
+        self, game_config: GameConfig, ai_config: BrainConfig
+    ) -> concurrent.futures.Future:
+        """Ask for the moves of the active player.
+
+        The Future result is an `AIResponse`, see `Board.decode_moves` for the moves.
+        """
+        if self._executor is None:
+            self._start()
+
+        self._last_request_id += 1
+        request = AIRequest(
+            request_id=self._last_request_id,
+            board=game_config.board.to_bytes(),
+            active_player=game_config.active_player,
+            step=game_config.step,
+            crapette_mode=game_config.crapette_mode,
+            ai_config=ai_config,
+            log_path=game_config.log_path,
+        )
+        self._current_request_id.value = request.request_id
+        self._future = self._executor.submit(solve, request)
+        return self._future
+
+    def is_current(self, future: concurrent.futures.Future) -> bool:
+        """Check if the future is the one of the last request, and was not cancelled."""
+        return future is self._future
+
+    def cancel(self):
+        """Make the current request stale, its search stops as soon as possible."""
+        if self._future is None:
+            return
+        self._future.cancel()
+        self._future = None
+        self._current_request_id.value = 0
+
+    def shutdown(self):
+        """Stop the worker."""
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -3,10 +3,10 @@
 import itertools
 import typing
 
-from line_profiler import profile
+from crapette.profiling import profile
 
 from .cards import Card, new_deck
-from .moves import Move
+from .moves import Flip, FlipWaste, Move
 from .piles import (
     FoundationPile,
     Pile,
@@ -17,7 +17,7 @@ from .piles import (
 )
 
 if typing.TYPE_CHECKING:
-    from crapette.game_manager import GameConfig
+    from crapette.core.game_config import GameConfig
 
 
 class Board:
@@ -63,6 +63,12 @@ class Board:
     def __str__(self):
         return self.__repr__()
 
+    def set_game_config(self, game_config: "GameConfig"):
+        """Set the GameConfig of the board and of the piles needing it."""
+        self.game_config = game_config
+        for player_piles_ in self.players_piles:
+            player_piles_.waste.set_game_config(game_config)
+
     def new_game(self, game_config: "GameConfig"):
         """Reset the board and distribute the cards for a new game."""
         self.game_config = game_config
@@ -110,6 +116,89 @@ class Board:
             foundation_pile.clear()
             assert len(foundation_pile) == 0
 
+    def to_bytes(self) -> bytes:
+        """Compact encoding of the board.
+
+        For each pile in `piles` order, the number of cards is followed by the
+        cards encoded with `Card.to_byte`. The Rust AI reads this format directly.
+        """
+        data = bytearray()
+        for pile in self.piles:
+            data.append(len(pile))
+            data.extend(card.to_byte() for card in pile)
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Board":
+        """Create a new board from an encoding made by `to_bytes`."""
+        board = cls()
+        offset = 0
+        for pile in board.piles:
+            nb_cards = data[offset]
+            offset += 1
+            pile.set_cards(
+                [Card.from_byte(b) for b in data[offset : offset + nb_cards]]
+            )
+            offset += nb_cards
+        if offset != len(data):
+            raise ValueError(f"Invalid board encoding, {len(data) - offset} bytes left")
+        return board
+
+    def encode_move(self, move: Move | Flip | FlipWaste) -> tuple[int, ...]:
+        """Encode a move as a tuple of ints, see `decode_moves`.
+
+        Cards are encoded with `Card.to_byte` and piles by their index in `piles`.
+        """
+        if isinstance(move, Move):
+            return (
+                move.card.to_byte(),
+                PILE_IDS[move.origin.name],
+                PILE_IDS[move.destination.name],
+            )
+        if isinstance(move, Flip):
+            return (move.card.to_byte(), PILE_IDS[move.pile.name])
+        return ()
+
+    def decode_moves(self, encoded_moves) -> list[Move | Flip | FlipWaste]:
+        """Decode moves encoded with `encode_move`, using the cards and piles of the board."""
+        piles = self.piles
+        cards = {card: card for pile in piles for card in pile}
+        moves = []
+        for encoded_move in encoded_moves:
+            if len(encoded_move) == 3:
+                card_byte, origin_id, destination_id = encoded_move
+                card = cards[Card.from_byte(card_byte)]
+                moves.append(Move(card, piles[origin_id], piles[destination_id]))
+            elif len(encoded_move) == 2:
+                card_byte, pile_id = encoded_move
+                moves.append(Flip(cards[Card.from_byte(card_byte)], piles[pile_id]))
+            else:
+                moves.append(FlipWaste())
+        return moves
+
+    def play_move(self, move: Move | Flip | FlipWaste, player: int):
+        """Apply a move of the player on the board.
+
+        Nothing is checked here. The piles are looked up by name,
+        so the move may come from another board, for example a `HashBoard`.
+        """
+        piles = self.piles
+        if isinstance(move, Move):
+            card = piles[PILE_IDS[move.origin.name]].pop_card()
+            piles[PILE_IDS[move.destination.name]].add_card(card)
+        elif isinstance(move, Flip):
+            piles[PILE_IDS[move.pile.name]].face_up = True
+        else:
+            self.flip_waste_to_stock(player)
+
+    def flip_waste_to_stock(self, player: int):
+        """When the stock is empty, flip the waste back to the stock."""
+        player_piles_ = self.players_piles[player]
+        player_piles_.stock.set_cards(player_piles_.waste[::-1])
+        player_piles_.waste.clear()
+        for card in player_piles_.stock:
+            card.face_up = False
+
     def compute_first_player(self):
         """Compute the starting player.
 
@@ -209,6 +298,10 @@ class Board:
         return "\n".join(str_lines)
 
 
+# Index of the piles in `Board.piles` from their name, used to encode moves
+PILE_IDS = {pile.name: index for index, pile in enumerate(Board().piles)}
+
+
 class HashBoard(Board):
     """Create a hashable version of a Board.
 
@@ -26,6 +26,7 @@ class Card:
         "_face_up",
         "_color",
         "_hash_cache",
+        "_byte_cache",
         "suit_symbol",
         "rank_symbol",
         "rank_name",
@@ -42,6 +43,7 @@ class Card:
         self._face_up = False
         self._color = "r" if suit in self.RED else "b"
         self._hash_cache = hash((self.rank, self.suit))
+        self._byte_cache = rank | self.SUITS.index(suit) << 4 | player << 6
 
         self.suit_symbol = self.SUIT_SYMBOL[self.suit]
         self.rank_symbol = self.RANK_SYMBOL.get(self.rank, self.rank)
@@ -58,6 +60,21 @@ class Card:
         """Setter for the satate of the card."""
         self._face_up = bool(is_face_up)
 
+    def to_byte(self):
+        """Encode the card as an int fitting in a single byte.
+
+        Bits 0-3 are the rank, bits 4-5 the suit index in `SUITS`,
+        bit 6 the player and bit 7 if the card is face up.
+        """
+        return self._byte_cache | self._face_up << 7
+
+    @classmethod
+    def from_byte(cls, byte):
+        """Decode a card encoded with `to_byte`."""
+        card = cls(byte & 0x0F, cls.SUITS[byte >> 4 & 0x03], byte >> 6 & 0x01)
+        card._face_up = bool(byte & 0x80)
+        return card
+
     def is_same_color(self, other):
         """Check if this card has the same color (red or black) as another card."""
         return self._color == other._color
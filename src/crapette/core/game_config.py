@@ -0,0 +1,48 @@
+"""Configuration and state of a game, independent of the GUI."""
+
+import dataclasses
+import os
+from datetime import datetime
+from pathlib import Path
+
+from .board import Board
+from .moves import FlipWaste, Move
+
+LOG_DIR = Path(__file__).parent.parent / "log"
+
+
+@dataclasses.dataclass
+class GameConfig:
+    player_types: tuple[str] = ("player", "player")
+    seed: int | None = None
+    custom_game: str | None = None
+    active_player: int = 0
+    step: int = 0
+    last_move: None | Move | FlipWaste = None
+    crapette_mode: bool = False
+    start_time: str | None = None
+    log_path: Path = LOG_DIR
+    board: Board = dataclasses.field(default_factory=Board)
+
+    def generate_seed(self):
+        self.seed = int.from_bytes(os.urandom(8), "big")
+
+    @property
+    def current_seed(self) -> int | str | None:
+        if self.seed and self.custom_game is None:
+            raise RuntimeError("No seed nor custom game configured")
+        return self.custom_game or self.seed
+
+    def register(self):
+        self.start_time = str(datetime.now())
+        if os.name == "nt":
+            self.start_time = self.start_time.replace(":", "-")
+        self.log_path = LOG_DIR / f"{self.custom_game}_{self.start_time}.txt"
+
+    @property
+    def is_player_ai(self):
+        return self.player_types[self.active_player] == "ai"
+
+    @property
+    def is_opponent_ai(self):
+        return self.player_types[1 - self.active_player] == "ai"
@@ -0,0 +1,75 @@
+"""Log of the moves of a game, written to a file in the background."""
+
+import queue
+import threading
+from pathlib import Path
+
+from .board import Board
+
+GAME_LOG_LEVELS = ("none", "moves", "boards")
+
+
+class GameLogger:
+    """One buffered log file per game, written and flushed by a background thread.
+
+    The level selects what is logged:
+    - `none`: nothing, the file is not even created
+    - `moves`: one line per move
+    - `boards`: also the board rendered as text after each move, which is slower
+    """
+
+    FLUSH_INTERVAL = 1.0  # s
+    _CLOSE = object()
+
+    def __init__(self, path: Path, level: str = "moves"):
+        if level not in GAME_LOG_LEVELS:
+            raise ValueError(
+                f"Unknown log level {level}, expected one of {GAME_LOG_LEVELS}"
+            )
+        self.path = path
+        self.level = level
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = None
+        if level != "none":
+            self._thread = threading.Thread(
+                target=self._write_loop, name="GameLogger", daemon=True
+            )
+            self._thread.start()
+
+    def log_step(self, step: int, player: int, action: str, board: Board):
+        """Log a move, the board is only rendered at the `boards` level."""
+        if self._thread is None:
+            return
+        text = f"\n\n*** {step} ***\nPlayer {player}: {action}\n"
+        if self.level == "boards":
+            # Rendered now, the board will change before it's written
+            text += board.to_text()
+        self._queue.put(text)
+
+    def close(self):
+        """Write the pending logs and close the file."""
+        if self._thread is None:
+            return
+        self._queue.put(self._CLOSE)
+        self._thread.join()
+        self._thread = None
+
+    def _write_loop(self):
+        f = None
+        try:
+            while True:
+                try:
+                    text = self._queue.get(timeout=self.FLUSH_INTERVAL)
+                except queue.Empty:
+                    if f is not None:
+                        f.flush()
+                    continue
+                if text is self._CLOSE:
+                    return
+                if f is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    f = self.path.open("a", encoding="utf8")
+                f.write(text)
+        finally:
+            if f is not None:
+                f.close()
@@ -0,0 +1,100 @@
+"""Index of the legal moves of the top cards, updated after each move.
+
+A move only changes its origin and destination piles, so only the moves from or
+to these piles are checked again, instead of every pair of piles on the board.
+"""
+
+from .board import PILE_IDS, Board
+from .moves import Flip, Move
+from .piles import Pile
+
+
+class LegalMoveIndex:
+    """Legal moves of the top cards of the board, for both players.
+
+    Call `update` with the piles changed by a move, or `rebuild` after changing
+    the board otherwise, for example when the crapette mode is toggled since
+    the moves to the waste depend on it.
+    """
+
+    def __init__(self, board: Board):
+        self.board = board
+        self._piles = board.piles
+        # By player, the ids of the destinations by origin id, see `PILE_IDS`
+        self._destinations: list[list[set[int]]] = [
+            [set() for _ in self._piles] for _ in Board.PLAYERS
+        ]
+        self.rebuild()
+
+    def _is_legal(self, origin: Pile, destination: Pile, player: int) -> bool:
+        card = origin.top_card
+        return bool(
+            origin is not destination
+            and card is not None
+            and card.face_up
+            and origin.can_pop_card(player)
+            and destination.can_add_card(card, origin, player)
+        )
+
+    def rebuild(self):
+        """Check all the moves again."""
+        for player, destinations in zip(Board.PLAYERS, self._destinations, strict=True):
+            for origin_id, origin in enumerate(self._piles):
+                destinations[origin_id] = {
+                    destination_id
+                    for destination_id, destination in enumerate(self._piles)
+                    if self._is_legal(origin, destination, player)
+                }
+
+    def update(self, *piles: Pile):
+        """Check again the moves from or to the piles changed on the board."""
+        changed_ids = [PILE_IDS[pile.name] for pile in piles]
+        for player, destinations in zip(Board.PLAYERS, self._destinations, strict=True):
+            for changed_id in changed_ids:
+                changed = self._piles[changed_id]
+                for pile_id, pile in enumerate(self._piles):
+                    # From the changed pile
+                    if self._is_legal(changed, pile, player):
+                        destinations[changed_id].add(pile_id)
+                    else:
+                        destinations[changed_id].discard(pile_id)
+                    # To the changed pile
+                    if self._is_legal(pile, changed, player):
+                        destinations[pile_id].add(changed_id)
+                    else:
+                        destinations[pile_id].discard(changed_id)
+
+    def moves(self, player: int) -> list[Move]:
+        """Legal moves of the player, with the cards and piles of the board."""
+        moves = []
+        for origin_id, destination_ids in enumerate(self._destinations[player]):
+            origin = self._piles[origin_id]
+            moves.extend(
+                Move(origin.top_card, origin, self._piles[destination_id])
+                for destination_id in sorted(destination_ids)
+            )
+        return moves
+
+    def destinations(self, pile: Pile, player: int) -> list[Pile]:
+        """Piles where the player can move the top card of the pile."""
+        destination_ids = self._destinations[player][PILE_IDS[pile.name]]
+        return [
+            self._piles[destination_id] for destination_id in sorted(destination_ids)
+        ]
+
+    def playable_piles(self, player: int) -> list[Pile]:
+        """Piles whose top card can be moved by the player."""
+        return [
+            self._piles[origin_id]
+            for origin_id, destination_ids in enumerate(self._destinations[player])
+            if destination_ids
+        ]
+
+    def flips(self, player: int) -> list[Flip]:
+        """Face down top cards that the player can flip, on their stock or crape."""
+        player_piles = self.board.players_piles[player]
+        return [
+            Flip(pile.top_card, pile)
+            for pile in (player_piles.crape, player_piles.stock)
+            if pile and not pile.face_up
+        ]
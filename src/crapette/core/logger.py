@@ -0,0 +1,9 @@
+"""Logging for the core and the brain, without depending on Kivy.
+
+When the GUI runs, Kivy attaches its handlers to the root logger,
+so these messages are shown in the Kivy log.
+"""
+
+import logging
+
+Logger = logging.getLogger("crapette")
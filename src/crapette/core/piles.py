@@ -1,12 +1,12 @@
 """Class for pile of cards parameters and methods."""
 
+import logging
 from typing import NamedTuple
 
-from kivy.logger import LOG_LEVELS, Logger
-
 from .cards import Card
+from .logger import Logger
 
-if Logger.isEnabledFor(LOG_LEVELS["debug"]):
+if Logger.isEnabledFor(logging.DEBUG):
     logger_debug = Logger.debug
 else:
 
@@ -0,0 +1,113 @@
+"""Compact binary snapshot of a game in progress.
+
+A snapshot contains the board and the `GameConfig` fields needed to resume
+the game without replaying it. Snapshots can be concatenated in a single file,
+for example to store a corpus of positions.
+
+Format, little endian:
+- header: magic `CRSN`, version, player types (0 for a player, 1 for an AI),
+  active player (255 if None), step, crapette mode
+- last move: size in bytes, then the move encoded by `Board.encode_move`
+- board: size in bytes, then the board encoded by `Board.to_bytes`
+"""
+
+import struct
+from collections.abc import Iterator
+from pathlib import Path
+
+from .board import Board
+from .game_config import GameConfig
+from .moves import Flip, FlipWaste, Move
+
+MAGIC = b"CRSN"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBBIB")
+SIZE = struct.Struct("<H")
+PLAYER_TYPES = ("player", "ai")
+NO_PLAYER = 255
+
+
+def dump_snapshot(
+    game_config: GameConfig, last_move: Move | Flip | FlipWaste | None = None
+) -> bytes:
+    """Encode the game as a snapshot.
+
+    `last_move` must use the cards and piles of the board, it defaults to
+    `game_config.last_move`.
+    """
+    if last_move is None:
+        last_move = game_config.last_move
+    board = game_config.board
+    move_bytes = b"" if last_move is None else bytes(board.encode_move(last_move))
+    board_bytes = board.to_bytes()
+    return b"".join(
+        [
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                *(PLAYER_TYPES.index(t) for t in game_config.player_types),
+                (
+                    NO_PLAYER
+                    if game_config.active_player is None
+                    else game_config.active_player
+                ),
+                game_config.step,
+                game_config.crapette_mode,
+            ),
+            bytes((len(move_bytes),)),
+            move_bytes,
+            SIZE.pack(len(board_bytes)),
+            board_bytes,
+        ]
+    )
+
+
+def iter_snapshots(data: bytes) -> Iterator[GameConfig]:
+    """Decode the concatenated snapshots."""
+    offset = 0
+    while offset < len(data):
+        magic, version, type0, type1, active_player, step, crapette_mode = (
+            HEADER.unpack_from(data, offset)
+        )
+        if magic != MAGIC:
+            raise ValueError(f"Invalid snapshot at offset {offset}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        offset += HEADER.size
+
+        move_size = data[offset]
+        offset += 1
+        encoded_move = tuple(data[offset : offset + move_size])
+        offset += move_size
+
+        (board_size,) = SIZE.unpack_from(data, offset)
+        offset += SIZE.size
+        board = Board.from_bytes(data[offset : offset + board_size])
+        offset += board_size
+
+        game_config = GameConfig(
+            player_types=(PLAYER_TYPES[type0], PLAYER_TYPES[type1]),
+            active_player=None if active_player == NO_PLAYER else active_player,
+            step=step,
+            crapette_mode=bool(crapette_mode),
+            board=board,
+        )
+        board.set_game_config(game_config)
+        if move_size:
+            (game_config.last_move,) = board.decode_moves([encoded_move])
+        yield game_config
+
+
+def load_snapshot(data: bytes) -> GameConfig:
+    """Decode a single snapshot."""
+    (game_config,) = iter_snapshots(data)
+    return game_config
+
+
+def save_snapshots(path: Path, game_configs: list[GameConfig]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"".join(dump_snapshot(g) for g in game_configs))
+
+
+def load_snapshots(path: Path) -> list[GameConfig]:
+    return list(iter_snapshots(path.read_bytes()))
@@ -5,8 +5,9 @@ Mostly used for initialisation and use of .kv file.
 
 import argparse
 import dataclasses
+import logging
 import sys
-from inspect import getmodule
+import timeit
 from pathlib import Path
 from pprint import pprint
 
@@ -21,18 +22,28 @@ from kivy.properties import BooleanProperty, NumericProperty
 
 # Load all widgets
 from . import (
+    START_TIME,
     custom_test_games,
     widgets,  # noqa: F401
 )
-from .brain.brainforce import BrainConfig
+from .brain.config import BrainConfig, add_brain_arguments, brain_config_from_args
 from .core.board import Board
-from .game_manager import GameManager
-from .images.card_data import CARD_IMG
+from .core.game_logger import GAME_LOG_LEVELS
+from .game_manager import FAST_FORWARD_EVENTS, GameManager
+from .images.card_data import (
+    CARD_IMG,
+    iter_preload_card_textures,
+    select_tier,
+    set_tier,
+)
 
 kivy.require("1.10.0")
 kivy.resources.resource_add_path(str(Path(__file__).parent))
 kivy.config.Config.set("input", "mouse", "mouse,multitouch_on_demand")
 Logger.setLevel(LOG_LEVELS["info"])  # debug, info, warning, error, critical, trace
+logging.getLogger("crapette").setLevel(Logger.level)  # See crapette.core.logger
+
+PRELOAD_SLICE = 0.01  # s, card textures loaded per frame
 
 
 @dataclasses.dataclass
@@ -40,6 +51,15 @@ class AppConfig:
     input_seed: int | None = None
     custom_game: str | None = None
     fast_animations: bool = False
+    # Speed factor of the AI animations and delays, see GameManager.ai_play
+    animation_speed: float = 1.0
+    # No AI animation nor delay, the AI plays at the engine speed
+    instant: bool = False
+    # Fast forward of AI vs AI games with the "f" key, see GameManager.fast_forward
+    fast_forward_turns: int = 0  # 0 for no limit
+    fast_forward_until: str = "end"
+    max_fps: float = 0  # Widgets updates during the fast forward, 0 for none
+    game_log: str = "moves"  # See GameLogger
 
     ai: BrainConfig = dataclasses.field(default_factory=BrainConfig)
 
@@ -62,6 +82,7 @@ class CrapetteApp(App):
     def build(self):
         # Just set the property so that it's available in kv
         self.card_overlap: float = CARD_IMG.OFFSET_FACTOR
+        self.card_tier: str | None = None  # See do_resize
 
         self.game_manager = GameManager(self)
 
@@ -69,12 +90,24 @@ class CrapetteApp(App):
         Window.bind(on_resize=self.on_window_resize)
 
         self._do_resize_event = None
+        self._preload_event = None
+
+        Window.bind(on_flip=self.on_first_frame)
 
         # Force a windows refresh on startup
         Clock.schedule_once(
             lambda _dt: self.do_resize(self.root.width, self.root.height), 0
         )
 
+    def on_first_frame(self, _window):
+        Window.unbind(on_flip=self.on_first_frame)
+        Logger.info(
+            "Startup: first frame after %.3f s", timeit.default_timer() - START_TIME
+        )
+
+    def on_stop(self):
+        self.game_manager.close()
+
     def on_window_resize(self, _window, width: int, height: int):
         if self._do_resize_event is not None:
             self._do_resize_event.cancel()
@@ -88,6 +121,7 @@ class CrapetteApp(App):
         """Delay the layout computing to avoid visual lag."""
         self.card_height = height / Board.NB_ROWS
         self.card_width = self.card_height * CARD_IMG.RATIO
+        self.update_card_tier()
 
         game_width_max = 2 * (
             self.card_height + self.card_width * (1 + 12 * self.card_overlap)
@@ -98,6 +132,36 @@ class CrapetteApp(App):
         game_height = self.card_height * Board.NB_ROWS
         self.wide = width / height > game_width_max / game_height
 
+    def update_card_tier(self):
+        """Use the card images with the resolution closest to the card size."""
+        tier = select_tier(self.card_height)
+        if tier == self.card_tier:
+            return
+        Logger.info("Cards: use the %s images", tier)
+        self.card_tier = tier
+        set_tier(tier)
+        self.game_manager.board_widget.update_card_images()
+        self.preload_card_textures()
+
+    def preload_card_textures(self):
+        """Load the textures of the card tier between the frames.
+
+        The startup is not delayed, the missing textures are loaded on demand.
+        """
+        if self._preload_event is not None:
+            self._preload_event.cancel()
+        loader = iter_preload_card_textures()
+
+        def load(_dt):
+            slice_start = timeit.default_timer()
+            for _ in loader:
+                if timeit.default_timer() - slice_start > PRELOAD_SLICE:
+                    return True
+            self._preload_event = None
+            return False  # Unschedule
+
+        self._preload_event = Clock.schedule_interval(load, 0)
+
     def set_menu_visible(self, menu_visible: bool):
         ids = self.root.ids
 
@@ -125,6 +189,18 @@ class CrapetteApp(App):
             player0, player1, self.app_config.input_seed, self.app_config.custom_game
         )
 
+    def resume_saved_game(self):
+        """Resume the game saved with the "s" key, see `GameManager.save_snapshot`."""
+        if self.game_manager.resume_snapshot():
+            self.set_menu_visible(False)
+
+
+def positive_float(value: str) -> float:
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive: {value}")
+    return number
+
 
 def parse_args(argv):
     parser = argparse.ArgumentParser(prog="crapette", description="Play Crapette")
@@ -136,17 +212,10 @@ def parse_args(argv):
         help="Seed for a game, used to replay a given game. The seed of the games are given on game startup.",
     )
 
-    custom_choices = [
-        f
-        for f in dir(custom_test_games)
-        if not f.startswith("_")
-        and f.islower()
-        and getmodule(getattr(custom_test_games, f)) == custom_test_games
-    ]
     group.add_argument(
         "-c",
         "--custom",
-        choices=custom_choices,
+        choices=custom_test_games.game_names(),
         help="Name of a predetermined play, for testing purpose.",
     )
     parser.add_argument(
@@ -155,28 +224,62 @@ def parse_args(argv):
         action="store_true",
         help="Speed up the animations.",
     )
-    ai_group = parser.add_argument_group("AI", "Options to control the AI behavior.")
-    for field in dataclasses.fields(BrainConfig):
-        name_cli = field.name.replace("_", "-")
-        if field.type is bool:
-            ai_group.add_argument(
-                f"--{name_cli}",
-                action=argparse.BooleanOptionalAction,
-                default=field.default,
-                help=name_cli,
-            )
-        else:
-            raise ValueError(f"Unknown field type {field.type} for {field.name}")
+    parser.add_argument(
+        "--speed",
+        type=positive_float,
+        default=1.0,
+        help="Speed factor of the AI animations and delays.",
+    )
+    parser.add_argument(
+        "--instant",
+        action="store_true",
+        help="Play the AI moves without animation nor delay.",
+    )
+    parser.add_argument(
+        "--game-log",
+        choices=GAME_LOG_LEVELS,
+        default="moves",
+        help="What is written to the game log file, boards are slow to render.",
+    )
+    ff_group = parser.add_argument_group(
+        "Fast forward",
+        'Options of the fast forward of AI vs AI games, with the "f" key.',
+    )
+    ff_group.add_argument(
+        "--ff-turns",
+        type=int,
+        default=0,
+        help="Number of turns to fast forward, 0 for no limit.",
+    )
+    ff_group.add_argument(
+        "--ff-until",
+        choices=FAST_FORWARD_EVENTS,
+        default="end",
+        help="Event stopping the fast forward, the end of the game always does.",
+    )
+    ff_group.add_argument(
+        "--max-fps",
+        type=float,
+        default=0,
+        help="Maximum number of board updates per second during the fast forward, 0 to update it only at the end.",
+    )
+    add_brain_arguments(parser)
 
     args = parser.parse_args(argv)
-    app_config = AppConfig(
-        input_seed=args.seed, custom_game=args.custom, fast_animations=args.fast
+    return AppConfig(
+        input_seed=args.seed,
+        custom_game=args.custom,
+        fast_animations=args.fast,
+        animation_speed=args.speed,
+        instant=args.instant,
+        fast_forward_turns=args.ff_turns,
+        fast_forward_until=args.ff_until,
+        max_fps=args.max_fps,
+        game_log=args.game_log,
+        ai=brain_config_from_args(args),
     )
-    for field in dataclasses.fields(BrainConfig):
-        setattr(app_config.ai, field.name, getattr(args, field.name))
-    return app_config
 
 
-def main():
-    app_config = parse_args(sys.argv[1:])
+def main(argv=None):
+    app_config = parse_args(sys.argv[1:] if argv is None else argv)
     CrapetteApp(app_config).run()
@@ -1,4 +1,6 @@
-from crapette import rust_brain
+import sys
+from inspect import getmodule
+
 from crapette.core.board import Board
 from crapette.core.cards import Card, new_deck
 
@@ -15,8 +17,6 @@ def foundation_to_fill(board: Board):
     # Diamonds King on a tableau pile
     board.tableau_piles[0].set_cards(deck[Card.NB_RANKS - 1 : Card.NB_RANKS])
 
-    print(repr(rust_brain.compute(board, 0, False, "")))
-
 
 def empty_stock(board: Board):
     """Set the game to check for empty stock and waste."""
@@ -27,8 +27,6 @@ def empty_stock(board: Board):
     # Fill waste with Diamonds
     board.players_piles[0].waste.set_cards(deck[:13])
 
-    print(repr(rust_brain.compute(board, 0, False, "")))
-
 
 def empty_stock_and_waste(board: Board):
     """Set the game to check for empty stock and waste."""
@@ -47,8 +45,6 @@ def empty_stock_and_waste(board: Board):
 
     # TODO: The game should not be locked, add a button to end the turn
 
-    print(repr(rust_brain.compute(board, 0, False, "")))
-
 
 def brain_combination(board: Board):
     deck = new_deck(player=0, shuffle=False)
@@ -66,4 +62,15 @@ def brain_combination(board: Board):
 
     board.players_piles[0].crape.add_card(diamonds[0])
 
-    print(repr(rust_brain.compute(board, 0, False, "")))
+
+def game_names() -> list[str]:
+    """Names of the custom test games, the functions of this module setting a board."""
+    module = sys.modules[__name__]
+    return [
+        f
+        for f in dir(module)
+        if not f.startswith("_")
+        and f.islower()
+        and f != "game_names"
+        and getmodule(getattr(module, f)) == module
+    ]
@@ -1,23 +1,24 @@
 """Manage the widgets interaction on the game board."""
 
-import dataclasses
-import multiprocessing
-import os
 import random
+import timeit
 import typing
-from datetime import datetime
+from concurrent.futures import BrokenExecutor
 from pathlib import Path
 
 from kivy.clock import Clock
 from kivy.logger import Logger
 
-from crapette import rust_brain
-
 from . import custom_test_games
-from .brain.brainforce import AIError, BrainForce
+from .brain.config import AIError, SearchCancelledError
 from .core.board import Board
+from .core.game_config import LOG_DIR, GameConfig
+from .core.game_logger import GameLogger
+from .core.legal_moves import LegalMoveIndex
 from .core.moves import Flip, FlipWaste, Move
 from .core.piles import CrapePile, FoundationPile, StockPile, TableauPile, WastePile
+from .core.snapshot import dump_snapshot, load_snapshot
+from .game_record import GameRecord
 from .widgets.card_widget import (
     DEFAULT_FLIP_DURATION,
     DEFAULT_MOVE_DURATION,
@@ -26,46 +27,19 @@ from .widgets.card_widget import (
 from .widgets.pile_widgets import PileWidget, PlayerPileWidget
 
 if typing.TYPE_CHECKING:
-    from .widgets.board_widget import BoardWidget
-
-
-@dataclasses.dataclass
-class GameConfig:
-    player_types: tuple[str] = ("player", "player")
-    seed: int | None = None
-    custom_game: str | None = None
-    active_player: int = 0
-    step: int = 0
-    last_move: None | Move | FlipWaste = None
-    crapette_mode: bool = False
-    start_time: str | None = None
-    log_path: Path = Path(__file__).parent / "log"
-    board: Board = dataclasses.field(default_factory=Board)
+    from concurrent.futures import Future
 
-    def generate_seed(self):
-        self.seed = int.from_bytes(os.urandom(8), "big")
-
-    @property
-    def current_seed(self) -> int | str | None:
-        if self.seed and self.custom_game is None:
-            raise RuntimeError("No seed nor custom game configured")
-        return self.custom_game or self.seed
-
-    def register(self):
-        self.start_time = str(datetime.now())
-        log_parent_dir = Path(__file__).parent / "log"
-        log_parent_dir.mkdir(parents=True, exist_ok=True)
-        if os.name == "nt":
-            self.start_time = self.start_time.replace(":", "-")
-        self.log_path = log_parent_dir / f"{self.custom_game}_{self.start_time}.txt"
-
-    @property
-    def is_player_ai(self):
-        return self.player_types[self.active_player] == "ai"
+    from .brain.brainrust import RustSearch
+    from .brain.ponder import Ponderer
+    from .brain.worker import AIWorker
+    from .simulate import GameStats
+    from .widgets.board_widget import BoardWidget
 
-    @property
-    def is_opponent_ai(self):
-        return self.player_types[1 - self.active_player] == "ai"
+SEARCH_POLL_INTERVAL = 0.05  # s
+PONDER_DELAY = 0.5  # s, wait for the human player to stop moving cards
+SNAPSHOT_PATH = LOG_DIR / "saved_game.snapshot"
+FAST_FORWARD_SLICE = 0.05  # s, played between two frames
+FAST_FORWARD_EVENTS = ("end", "waste-flip", "crape-empty")
 
 
 class GameManager:
@@ -74,8 +48,21 @@ class GameManager:
         self.ids = self.app.root.ids
         self.board_widget: BoardWidget = self.ids["game_board"]
 
-        self._brain_process = None
+        # Created on first use, see `ai_worker` and `ponderer`
+        self._ai_worker: AIWorker | None = None
+        self._ponderer: Ponderer | None = None
+        self._ponder_trigger = Clock.create_trigger(
+            lambda _dt: self.ponder(), PONDER_DELAY
+        )
+        self._ai_future: Future | None = None
+        self._search: RustSearch | None = None
+        self.game_logger: GameLogger | None = None
+        self.game_record: GameRecord | None = None
+        self.legal_moves: LegalMoveIndex | None = None
         self.crapette_moves = []
+        self._fast_forward_requested = False
+        self._fast_forward_event = None
+        self._fast_forward_stats: GameStats | None = None
 
     def setup(
         self,
@@ -84,6 +71,7 @@ class GameManager:
         seed: int | None = None,
         custom_game: str | None = None,
     ):
+        self._stop_game()
         self.game_config = GameConfig(
             player_types=(player0, player1), seed=seed, custom_game=custom_game
         )
@@ -96,27 +84,130 @@ class GameManager:
             Logger.info("Game seed: %d", self.game_config.seed)
             random.seed(self.game_config.seed)
         self.game_config.board = Board()
-        self.game_config.register()
+        self._open_game_logger()
 
         if custom_game:
-            self.game_config.board.game_config = self.game_config
-            for player in range(2):
-                self.game_config.board.players_piles[player].waste.set_game_config(
-                    self.game_config
-                )
+            self.game_config.board.set_game_config(self.game_config)
             custom_new_game(self.game_config.board)
         else:
             self.game_config.board.new_game(self.game_config)
+        self.legal_moves = LegalMoveIndex(self.game_config.board)
         self.board_widget.setup(self)
 
-        self.set_active_player(
+        first_player = (
             self.board_widget.board.compute_first_player() if custom_game is None else 0
         )
+        self.game_record = GameRecord(
+            seed=self.game_config.seed,
+            custom_game=custom_game,
+            first_player=first_player,
+        )
+        self.set_active_player(first_player)
+
+        Clock.schedule_once(
+            lambda _dt: self.check_moves(),
+            0,
+        )
+
+    def _stop_game(self):
+        """Stop the AI and save the record of the current game."""
+        self._fast_forward_requested = False
+        if self._fast_forward_event is not None:
+            self._fast_forward_event.cancel()
+            self._fast_forward_event = None
+        self.cancel_search()
+        if self._ai_worker is not None:
+            self._ai_worker.cancel()
+        if self._ponderer is not None:
+            self._ponderer.clear()
+        self._ai_future = None
+        self.save_game_record()
+
+    @property
+    def ai_worker(self) -> "AIWorker":
+        """Worker of the AI searches, created on first use.
+
+        The AI modules are only imported here, they are not needed to show the menu.
+        """
+        if self._ai_worker is None:
+            from .brain.worker import AIWorker  # noqa: PLC0415
+
+            self._ai_worker = AIWorker(use_process=not self.app.app_config.ai.mono)
+        return self._ai_worker
+
+    @property
+    def ponderer(self) -> "Ponderer":
+        if self._ponderer is None:
+            from .brain.ponder import Ponderer  # noqa: PLC0415
+
+            self._ponderer = Ponderer(self.ai_worker)
+        return self._ponderer
+
+    def _open_game_logger(self):
+        self.game_config.register()
+        if self.game_logger is not None:
+            self.game_logger.close()
+        self.game_logger = GameLogger(
+            self.game_config.log_path, self.app.app_config.game_log
+        )
+
+    def save_snapshot(self, path: Path = SNAPSHOT_PATH) -> bool:
+        """Save the current game to resume it later, see `crapette.core.snapshot`.
+
+        The game can't be saved in crapette mode or once it's finished.
+        """
+        if self.game_config.active_player is None or self.game_config.crapette_mode:
+            Logger.info("Snapshot: nothing to save")
+            return False
+        last_move = self.game_config.last_move
+        if isinstance(last_move, Move):
+            last_move = Move(
+                last_move.card.card, last_move.origin.pile, last_move.destination.pile
+            )
+        elif isinstance(last_move, Flip):
+            last_move = Flip(last_move.card.card, last_move.pile.pile)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(dump_snapshot(self.game_config, last_move))
+        Logger.info("Snapshot: game saved to %s", path)
+        return True
+
+    def resume_snapshot(self, path: Path = SNAPSHOT_PATH) -> bool:
+        """Resume a game saved with `save_snapshot`.
+
+        The resumed game has no game record, since its start is unknown.
+        """
+        if not path.exists():
+            Logger.info("Snapshot: no saved game in %s", path)
+            return False
+        self._stop_game()
+        self.game_config = load_snapshot(path.read_bytes())
+        self.game_record = None
+        self._open_game_logger()
+        self.legal_moves = LegalMoveIndex(self.game_config.board)
+        self.board_widget.setup(self)
+
+        # The last move is needed by the crapette mode, with widgets
+        last_move = self.game_config.last_move
+        if isinstance(last_move, Move):
+            self.game_config.last_move = Move(
+                self.board_widget.card_widgets[last_move.card],
+                self.board_widget.widget_from_pile(last_move.origin),
+                self.board_widget.widget_from_pile(last_move.destination),
+            )
+        elif isinstance(last_move, Flip):
+            self.game_config.last_move = Flip(
+                self.board_widget.card_widgets[last_move.card],
+                self.board_widget.widget_from_pile(last_move.pile),
+            )
+        self.board_widget.set_active_player()
+        self.board_widget.update_crapette_button_status()
+        Logger.info("Snapshot: game resumed from %s", path)
 
         Clock.schedule_once(
             lambda _dt: self.check_moves(),
             0,
         )
+        return True
 
     def set_active_player(self, player: int):
         """Change the active player and updates the GUI accordingly."""
@@ -126,6 +217,7 @@ class GameManager:
         self.game_config.active_player = player
 
         self.board_widget.set_active_player()
+        self._ponder_trigger()
 
     def check_end_of_turn(self, pile_widget: PileWidget):
         """End the player turn if conditions are met."""
@@ -143,6 +235,7 @@ class GameManager:
         """End the game if the player has won."""
         if self.game_config.board.check_win(self.game_config.active_player):
             print(f"Player {self.game_config.active_player} wins !!!")
+            self.save_game_record()
             label = self.ids[f"player{self.game_config.active_player}winlabel"]
             label.text = f"Player {self.game_config.active_player} wins !!!"
 
@@ -165,10 +258,12 @@ class GameManager:
         card_widget: CardWidget,
         pile_widget: PileWidget,
         duration=DEFAULT_MOVE_DURATION,
+        delay=0,
     ):
         """Move a card to another pile and register the move.
 
         It only checks the destination, not if the card was movable by the player.
+        The move is registered at once, only its animation starts after `delay`.
         """
         old_pile_widget = card_widget.pile_widget
 
@@ -185,10 +280,12 @@ class GameManager:
             card_widget.animate_move_to_pile()
             return
 
-        self.board_widget.move_card(card_widget, pile_widget, duration=duration)
+        self.board_widget.move_card(card_widget, pile_widget, duration, delay)
+        self.legal_moves.update(old_pile_widget.pile, pile_widget.pile)
 
         self.log_game_step(
-            f"move {card_widget.card.str_rank_suit} from {old_pile_widget.pile.name} to {pile_widget.pile.name}"
+            f"move {card_widget.card.str_rank_suit} from {old_pile_widget.pile.name} to {pile_widget.pile.name}",
+            Move(card_widget.card, old_pile_widget.pile, pile_widget.pile),
         )
 
         if self.check_win():
@@ -213,9 +310,15 @@ class GameManager:
             self.check_crapette_valid(move)
             if self.check_crapette_valid(move):
                 self.capette_mode_end(valid=True)
+        self._ponder_trigger()
+
+    def flip_card_up(
+        self, card_widget: CardWidget, duration=DEFAULT_FLIP_DURATION, delay=0
+    ):
+        """Flips up the card and register the flip as a move.
 
-    def flip_card_up(self, card_widget: CardWidget, duration=DEFAULT_FLIP_DURATION):
-        """Flips up the card and register the flip as a move."""
+        The flip is registered at once, only its animation starts after `delay`.
+        """
         last_move = self.game_config.last_move
         pile_widget = card_widget.pile_widget
         if self.game_config.crapette_mode and not (
@@ -233,9 +336,13 @@ class GameManager:
             if self.game_config.is_player_ai:
                 raise AIError("AI tried to flip opponent stock pile in crapette mode")
             return
-        self.board_widget.flip_card_up(card_widget, duration)
+        self.board_widget.flip_card_up(card_widget, duration, delay)
+        self.legal_moves.update(pile_widget.pile)
 
-        self.log_game_step(f"flip card up in {pile_widget.pile.name}")
+        self.log_game_step(
+            f"flip card up in {pile_widget.pile.name}",
+            Flip(card_widget.card, pile_widget.pile),
+        )
 
         if self.game_config.crapette_mode:
             if self.check_crapette_valid(Flip(card_widget, pile_widget)):
@@ -245,8 +352,9 @@ class GameManager:
 
         if not self.game_config.is_player_ai:
             self.check_moves()
+        self._ponder_trigger()
 
-    def flip_waste_to_stock(self):
+    def flip_waste_to_stock(self, duration=DEFAULT_MOVE_DURATION, delay=0):
         """When the stock is empty, flip the waste back to the stock.
 
         Note: It's not a move in regards to crapette mode.
@@ -255,9 +363,13 @@ class GameManager:
             if self.game_config.is_player_ai:
                 raise AIError("AI tried to flip waste to stock in crapette mode")
             return
-        self.board_widget.flip_waste_to_stock()
+        self.board_widget.flip_waste_to_stock(duration, delay)
+        player_piles = self.game_config.board.players_piles[
+            self.game_config.active_player
+        ]
+        self.legal_moves.update(player_piles.stock, player_piles.waste)
 
-        self.log_game_step("flip waste to stock")
+        self.log_game_step("flip waste to stock", FlipWaste())
 
     def toggle_crapette_mode(self):
         if not self.game_config.last_move:
@@ -270,8 +382,14 @@ class GameManager:
             for card_widget in self.board_widget.card_widgets.values():
                 card_widget.abort_moving()
             if isinstance(self.game_config.last_move, Move):
-                self.board_widget.move_card(
-                    self.game_config.last_move.card, self.game_config.last_move.origin
+                last_move = self.game_config.last_move
+                self.board_widget.move_card(last_move.card, last_move.origin)
+                self.record_move(
+                    Move(
+                        last_move.card.card,
+                        last_move.destination.pile,
+                        last_move.origin.pile,
+                    )
                 )
                 self.crapette_moves = [
                     Move(
@@ -282,6 +400,7 @@ class GameManager:
                 ]
             else:
                 self.crapette_moves = []
+            self.legal_moves.rebuild()
         else:
             self.capette_mode_end(valid=False)
 
@@ -321,8 +440,13 @@ class GameManager:
         if not valid:
             for move in self.crapette_moves[::-1]:
                 self.board_widget.move_card(move.card, move.origin)
+                self.record_move(
+                    Move(move.card.card, move.destination.pile, move.origin.pile)
+                )
             self.crapette_moves = []
+            self.legal_moves.rebuild()
         else:
+            self.legal_moves.rebuild()
             player = self.game_config.active_player
             pile = self.board_widget.crape_widgets[player].pile
             if pile and not pile.face_up:
@@ -339,72 +463,318 @@ class GameManager:
         # print("Checking moves...")
         if self.game_config.active_player is None:
             return  # End of game
+        if self._fast_forward_requested:
+            self._fast_forward_requested = False
+            self.fast_forward()
+            return
         if self.game_config.is_player_ai:
-            brain = BrainForce(self.game_config)
-            if self.app.app_config.ai.mono:
-                moves = brain.compute_states()
+            app_config = self.app.app_config
+            ai_config = app_config.ai
+            if app_config.instant:
+                delay = 0
             else:
-                if self._brain_process is not None:
-                    if self._brain_process.is_alive():
-                        self._brain_process.kill()
-                        self._brain_process.join()
-                    self._brain_process.close()
-
-                self._brain_process = multiprocessing.Process(
-                    target=brain.compute_states, daemon=True
-                )
-                self._brain_process.start()
+                delay = 0.2 if app_config.fast_animations else random.triangular(1, 3)
+                delay /= app_config.animation_speed
+            if ai_config.engine == "rust":
+                from .brain.engines import new_brain  # noqa: PLC0415
 
-            rust_brain.compute(
-                self.game_config.board,
-                self.game_config.active_player,
-                crapette_mode=False,
-                log_path="",
-            )
+                self._search = new_brain(self.game_config, ai_config).start_search()
+                self._play_when_done(self._search, delay)
+            else:
+                future = None
+                if ai_config.ponder and not self.game_config.crapette_mode:
+                    future = self.ponderer.lookup(self.game_config)
+                    if future is not None:
+                        Logger.debug("Pondering hit #%d", self.game_config.step)
+                if future is None:
+                    future = self.ai_worker.submit(self.game_config, ai_config)
+                self._ai_future = future
+                self._play_future_when_done(future, delay)
+
+    def toggle_fast_forward(self):
+        """Start the fast forward at the next AI turn, or stop it, see `fast_forward`."""
+        if self._fast_forward_event is not None:
+            self._fast_forward_requested = False
+            self._fast_forward_event.cancel()
+            self._fast_forward_event = None
+            self._end_fast_forward()
+            return
+        if self.game_config.active_player is None:
+            return  # End of game
+        if not (self.game_config.is_player_ai and self.game_config.is_opponent_ai):
+            Logger.info("Fast forward: only for AI vs AI games")
+            return
+        self._fast_forward_requested = not self._fast_forward_requested
+        Logger.info(
+            "Fast forward: %s",
+            "at the next turn" if self._fast_forward_requested else "cancelled",
+        )
+
+    def fast_forward(self):
+        """Play the AI turns on the board at the engine speed, without animation.
 
-            Clock.schedule_once(
-                lambda _dt: self.ai_play(moves),
-                0.2 if self.app.app_config.fast_animations else random.triangular(1, 3),
+        It stops after `AppConfig.fast_forward_turns` turns if set, or on the
+        `AppConfig.fast_forward_until` event, or at the end of the game.
+        The widgets are only updated at the end, or at most
+        `AppConfig.max_fps` times per second if set.
+        """
+        from .simulate import GameStats  # noqa: PLC0415
+
+        app_config = self.app.app_config
+        stats = self._fast_forward_stats = GameStats(self.game_config.seed)
+        frame_time = 1 / app_config.max_fps if app_config.max_fps else None
+        last_sync = timeit.default_timer()
+        Logger.info("Fast forward: start at step %d", self.game_config.step)
+
+        def play(_dt):
+            nonlocal last_sync
+            slice_start = timeit.default_timer()
+            while timeit.default_timer() - slice_start < FAST_FORWARD_SLICE:
+                if self._play_fast_forward_turn(stats):
+                    self._fast_forward_event = None
+                    self._end_fast_forward()
+                    return False  # Unschedule
+            if (
+                frame_time is not None
+                and timeit.default_timer() - last_sync > frame_time
+            ):
+                last_sync = timeit.default_timer()
+                self.board_widget.sync_cards()
+            return True
+
+        # Played between the frames, to keep the GUI responsive
+        self._fast_forward_event = Clock.schedule_interval(play, 0)
+
+    def _play_fast_forward_turn(self, stats: "GameStats") -> bool:
+        """Play a turn on the board only, return True if the fast forward ends."""
+        from .simulate import play_turn  # noqa: PLC0415
+
+        app_config = self.app.app_config
+        board = self.game_config.board
+        player = self.game_config.active_player
+        crape_was_empty = board.players_piles[player].crape.is_empty
+        played_moves = []
+
+        def log_move(_move):
+            # Logged when played, for the board of this step
+            encoded_move = played_moves[-1]
+            (move,) = board.decode_moves([encoded_move])
+            self.game_logger.log_step(
+                self.game_config.step, player, f"fast forward {move}", board
             )
+            if self.game_record is not None:
+                self.game_record.add_move(player, encoded_move)
 
-    def ai_play(self, moves: list):
-        move = moves.pop(0)
-        if self.app.app_config.ai.print_progress:
-            print("ai_play", self.game_config.step + 1, move)
-        duration = (
-            0.1 if self.app.app_config.fast_animations else random.triangular(0.3, 0.7)
+        over = play_turn(
+            self.game_config, app_config.ai, stats, played_moves, on_move=log_move
         )
-        if isinstance(move, Move):
-            self.move_card(
-                self.board_widget.card_widgets[move.card],
-                self.board_widget.widget_from_pile(move.destination),
-                duration=duration,
-            )
-        elif isinstance(move, Flip):
-            self.flip_card_up(
-                self.board_widget.card_widgets[move.card],
-                duration=duration,
-            )
-        elif isinstance(move, FlipWaste):
-            self.flip_waste_to_stock()
-            duration = 0.1 if self.app.app_config.fast_animations else 1
-        else:
-            raise AIError(f"Unknown move: {move}")
-        if moves:
-            duration += (
-                0.1
-                if self.app.app_config.fast_animations
-                else random.triangular(0.5, 0.9)
+
+        until = app_config.fast_forward_until
+        return (
+            over
+            or stats.turns == app_config.fast_forward_turns
+            or (until == "waste-flip" and () in played_moves)
+            or (
+                until == "crape-empty"
+                and not crape_was_empty
+                and board.players_piles[player].crape.is_empty
             )
-            Clock.schedule_once(lambda _dt: self.ai_play(moves), duration)
-        else:
-            Clock.schedule_once(lambda _dt: self.check_moves(), 0.2)
+        )
+
+    def _end_fast_forward(self):
+        stats = self._fast_forward_stats
+        self.legal_moves.rebuild()
+        self.board_widget.sync_cards()
+        Logger.info(
+            "Fast forward: stop at step %d after %d turns",
+            self.game_config.step,
+            stats.turns,
+        )
+        if stats.winner is not None:
+            self.check_win()
+            return
+        self.set_active_player(self.game_config.active_player)
+        Clock.schedule_once(lambda _dt: self.check_moves(), 0)
+
+    def ponder(self):
+        """Precompute the AI moves for the expected end of the human player turn."""
+        if (
+            not self.app.app_config.ai.ponder
+            # The Rust engine does not use the AI worker, see `check_moves`
+            or self.app.app_config.ai.engine == "rust"
+            or self.game_config.active_player is None
+            or self.game_config.crapette_mode
+            or self.game_config.is_player_ai
+            or not self.game_config.is_opponent_ai
+        ):
+            return
+        self.ponderer.ponder(self.game_config, self.app.app_config.ai)
+
+    def _play_future_when_done(
+        self, future: "Future", delay: float, retry: bool = True
+    ):
+        """Play the moves computed by the AI worker when they are available.
 
-    def log_game_step(self, action):
+        The delay includes the search time. If the worker died, the search is
+        submitted again to a new worker once if `retry` is set.
+        """
+        start_time = timeit.default_timer()
+
+        def play(_dt):
+            # Ignore stale requests, for example if a new game was started
+            if future is not self._ai_future:
+                return
+            try:
+                response = future.result()
+            except SearchCancelledError:
+                return
+            except BrokenExecutor:
+                Logger.exception("AI: the worker stopped")
+                self._ai_future = None
+                self.ai_worker.shutdown()  # A new worker starts with the next request
+                if retry:
+                    self._ai_future = self.ai_worker.submit(
+                        self.game_config, self.app.app_config.ai
+                    )
+                    self._play_future_when_done(self._ai_future, 0, retry=False)
+                return
+            except Exception:  # noqa: BLE001 An AI error must not stop the app
+                Logger.exception("AI: the search failed, the AI stops playing")
+                self._ai_future = None
+                return
+            self._ai_future = None
+            self.ai_play(self.game_config.board.decode_moves(response.moves))
+
+        def on_done(_future):
+            # Called from the worker thread, go back to the main thread through Clock
+            elapsed = timeit.default_timer() - start_time
+            Clock.schedule_once(play, max(0, delay - elapsed))
+
+        future.add_done_callback(on_done)
+
+    def _play_when_done(self, search: "RustSearch", delay: float):
+        """Poll the background search and play the moves when it's done.
+
+        The delay includes the search time.
+        """
+        start_time = timeit.default_timer()
+        game_config = self.game_config
+
+        def play(moves):
+            if self.game_config is not game_config:
+                return  # A new game was started during the delay
+            self.ai_play(moves)
+
+        def poll(_dt):
+            if search.cancelled:
+                return False  # Unschedule
+            if not search.done():
+                return True
+            moves = search.result()
+            self._search = None
+            elapsed = timeit.default_timer() - start_time
+            Clock.schedule_once(lambda _dt: play(moves), max(0, delay - elapsed))
+            return False  # Unschedule
+
+        Clock.schedule_interval(poll, SEARCH_POLL_INTERVAL)
+
+    def cancel_search(self):
+        """Stop the AI search running in the background, if any."""
+        if self._search is not None:
+            self._search.cancel()
+            self._search = None
+
+    def ai_play(self, moves: list):
+        """Play all the moves of the AI, and animate them one after the other.
+
+        The moves are registered at once, only their animations are delayed.
+        The pace depends on `AppConfig.animation_speed`, and there is no
+        animation at all with `AppConfig.instant`.
+        """
+        app_config = self.app.app_config
+        fast = app_config.fast_animations
+        delay = 0  # s, start of the animation of the move
+        end = 0  # s, end of the last animation
+        for move in moves:
+            if self.game_config.active_player is None:
+                break  # End of game
+            if app_config.ai.print_progress:
+                print("ai_play", self.game_config.step + 1, move)
+            duration = 0.1 if fast else random.triangular(0.3, 0.7)
+            pause = 0.1 if fast else random.triangular(0.5, 0.9)
+            if isinstance(move, FlipWaste):
+                duration = 0.1 if fast else 1
+            if app_config.instant:
+                duration = pause = 0
+            else:
+                duration /= app_config.animation_speed
+                pause /= app_config.animation_speed
+
+            if isinstance(move, Move):
+                self.move_card(
+                    self.board_widget.card_widgets[move.card],
+                    self.board_widget.widget_from_pile(move.destination),
+                    duration,
+                    delay,
+                )
+            elif isinstance(move, Flip):
+                self.flip_card_up(
+                    self.board_widget.card_widgets[move.card], duration, delay
+                )
+            elif isinstance(move, FlipWaste):
+                self.flip_waste_to_stock(duration, delay)
+            else:
+                raise AIError(f"Unknown move: {move}")
+            end = delay + duration
+            delay = end + pause
+
+        if end:
+            # The game is ahead of the animations, wait for them before letting
+            # the player touch the cards
+            self.board_widget.disabled = True
+
+        game_config = self.game_config
+
+        def done(_dt):
+            if self.game_config is not game_config:
+                return  # A new game was started
+            self.board_widget.disabled = not self.ids["menu"].disabled
+            self.check_moves()
+
+        Clock.schedule_once(done, end)
+
+    def log_game_step(self, action: str, move: Move | Flip | FlipWaste):
+        """Register a move, with the cards and piles of the board (not the widgets)."""
         self.game_config.step += 1
+        self.game_logger.log_step(
+            self.game_config.step,
+            self.game_config.active_player,
+            action,
+            self.game_config.board,
+        )
+        self.record_move(move)
 
-        with self.game_config.log_path.open("a", encoding="utf8") as f:
-            f.write(
-                f"\n\n*** {self.game_config.step} ***\nPlayer {self.game_config.active_player}: {action}\n"
-            )
-            f.write(self.game_config.board.to_text())
+    def record_move(self, move: Move | Flip | FlipWaste):
+        """Add a move to the game record, without counting it as a game step.
+
+        It's used directly for the moves undone by the crapette mode.
+        """
+        if self.game_record is None:
+            return  # Resumed game
+        self.game_record.add_move(
+            self.game_config.active_player, self.game_config.board.encode_move(move)
+        )
+
+    def save_game_record(self):
+        """Save the game record next to the game log, see `crapette.game_record`."""
+        if self.game_record is None or self.app.app_config.game_log == "none":
+            return
+        self.game_record.save(self.game_config.log_path.with_suffix(".jsonl"))
+
+    def close(self):
+        """Stop the background workers and write the pending logs."""
+        if self._ai_worker is not None:
+            self._ai_worker.shutdown()
+        self.save_game_record()
+        if self.game_logger is not None:
+            self.game_logger.close()
@@ -0,0 +1,129 @@
+"""Compact record of a game, and its headless replay.
+
+A record is a JSON lines file. The first line describes the start of the game:
+`{"version": 1, "seed": ..., "custom_game": ..., "first_player": ...}`,
+then each line is a move of a player as `[player, *encoded_move]`,
+see `Board.encode_move`.
+
+Replay a record with:
+
+    python -m crapette.game_record RECORD_FILE [--show STEP ...]
+"""
+
+import argparse
+import dataclasses
+import json
+import random
+import sys
+import timeit
+from collections.abc import Iterator
+from pathlib import Path
+
+from . import custom_test_games
+from .core.game_config import GameConfig
+
+RECORD_VERSION = 1
+
+
+@dataclasses.dataclass
+class GameRecord:
+    seed: int | None = None
+    custom_game: str | None = None
+    first_player: int = 0
+    # (player, *encoded_move)
+    moves: list[tuple[int, ...]] = dataclasses.field(default_factory=list)
+
+    def add_move(self, player: int, encoded_move: tuple[int, ...]):
+        self.moves.append((player, *encoded_move))
+
+    def save(self, path: Path):
+        header = {
+            "version": RECORD_VERSION,
+            "seed": self.seed,
+            "custom_game": self.custom_game,
+            "first_player": self.first_player,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf8") as f:
+            f.write(json.dumps(header) + "\n")
+            f.writelines(json.dumps(move) + "\n" for move in self.moves)
+
+    @classmethod
+    def load(cls, path: Path) -> "GameRecord":
+        with path.open(encoding="utf8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != RECORD_VERSION:
+                raise ValueError(f"Unsupported game record version in {path}")
+            moves = [tuple(json.loads(line)) for line in f if line.strip()]
+        return cls(
+            seed=header["seed"],
+            custom_game=header["custom_game"],
+            first_player=header["first_player"],
+            moves=moves,
+        )
+
+    def new_game(self) -> GameConfig:
+        """Set up the board at the start of the game."""
+        game_config = GameConfig(
+            seed=self.seed,
+            custom_game=self.custom_game,
+            active_player=self.first_player,
+        )
+        if self.custom_game:
+            game_config.board.set_game_config(game_config)
+            getattr(custom_test_games, self.custom_game)(game_config.board)
+        else:
+            random.seed(self.seed)
+            game_config.board.new_game(game_config)
+        return game_config
+
+    def replay(self) -> Iterator[GameConfig]:
+        """Replay the game, yielding the game after each move.
+
+        The same `GameConfig` and `Board` are modified in place.
+        """
+        game_config = self.new_game()
+        board = game_config.board
+        for player, *encoded_move in self.moves:
+            (move,) = board.decode_moves([encoded_move])
+            game_config.active_player = player
+            board.play_move(move, player)
+            game_config.step += 1
+            yield game_config
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="crapette.game_record", description="Replay a recorded game"
+    )
+    parser.add_argument("record", type=Path, help="Game record file.")
+    parser.add_argument(
+        "--show",
+        type=int,
+        nargs="*",
+        default=[],
+        help="Steps after which the board is printed, -1 for the end of the game.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    record = GameRecord.load(args.record)
+    nb_moves = len(record.moves)
+    show = {nb_moves if step == -1 else step for step in args.show}
+
+    start_time = timeit.default_timer()
+    if 0 in show:
+        print(record.new_game().board.to_text())
+    for game_config in record.replay():
+        if game_config.step in show:
+            print(f"*** {game_config.step} ***")
+            print(game_config.board.to_text())
+    elapsed = timeit.default_timer() - start_time
+
+    print(f"{nb_moves} moves replayed in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
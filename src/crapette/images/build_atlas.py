@@ -0,0 +1,74 @@
+"""Pack the card images into one Kivy atlas per tier, see `card_data.CARD_IMG.TIERS`.
+
+The tiers without images are generated by downscaling a larger tier.
+Run it once after installing the card images, see README.rst:
+
+    python -m crapette.images.build_atlas
+
+It needs Pillow, like `kivy.atlas`.
+"""
+
+import argparse
+import sys
+
+from kivy.atlas import Atlas
+from PIL import Image
+
+from .card_data import CARD_IMG, atlas_path, tier_path
+
+
+def generate_tier(tier: str, source_tier: str):
+    """Downscale the images of a larger tier."""
+    scale = CARD_IMG.TIERS[tier] / CARD_IMG.TIERS[source_tier]
+    tier_path(tier).mkdir(parents=True, exist_ok=True)
+    for source in tier_path(source_tier).glob("*.png"):
+        with Image.open(source) as image:
+            size = (round(image.width * scale), round(image.height * scale))
+            image.resize(size, Image.LANCZOS).save(tier_path(tier) / source.name)
+
+
+def build_atlas(tier: str, size: int):
+    filenames = sorted(str(path) for path in tier_path(tier).glob("*.png"))
+    path = atlas_path(tier)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    result = Atlas.create(str(path.with_suffix("")), filenames, size)
+    if not result:
+        sys.exit(f"The atlas of the {tier} tier could not be created")
+    _atlas_path, meta = result
+    print(f"{tier}: {len(filenames)} images packed in {len(meta)} atlas images")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="crapette.images.build_atlas", description="Build the card atlases"
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=4096,
+        help="Maximum size of an atlas image, more images are created if needed.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    # From the largest tier, so that the smaller ones can be generated from it
+    tiers = sorted(CARD_IMG.TIERS, key=CARD_IMG.TIERS.get, reverse=True)
+    source_tier = None
+    for tier in tiers:
+        if any(tier_path(tier).glob("*.png")):
+            source_tier = tier
+        elif source_tier is not None:
+            print(f"{tier}: generated from {source_tier}")
+            generate_tier(tier, source_tier)
+        else:
+            print(f"{tier}: no image in {tier_path(tier)}, skipped")
+            continue
+        build_atlas(tier, args.size)
+    if source_tier is None:
+        sys.exit(f"No card image in {CARD_IMG.DIR}, see README.rst")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,14 @@ This version uses cars provided for free (LGPL-2.1) on
 https://github.com/htdebeer/SVG-cards.
 """
 
+import json
 import types
 from pathlib import Path
 
 from kivy.core.image import Image as CoreImage
+from kivy.logger import Logger
+
+from crapette.core.cards import Card
 
 CARD_IMG = types.SimpleNamespace(
     SUIT_NAME={"c": "club", "d": "diamond", "h": "heart", "s": "spade"},
@@ -27,21 +31,130 @@ CARD_IMG = types.SimpleNamespace(
         "queen",
         "king",
     ],
-    PATH=Path(__file__).parent / "png" / "2x",
+    DIR=Path(__file__).parent / "png",
+    # Size of the 1x images, from the SVG cards, to avoid decoding an image
+    SIZE=(169.075, 244.640),
+    # Image sets by scale of the 1x size, the smallest ones are generated
+    # by `crapette.images.build_atlas`
+    TIERS={"0.5x": 0.5, "1x": 1, "2x": 2},
+    DEFAULT_TIER="2x",
+    OFFSET_FACTOR=0.2,  # %
 )
+CARD_IMG.WIDTH, CARD_IMG.HEIGHT = CARD_IMG.SIZE
+CARD_IMG.RATIO = CARD_IMG.WIDTH / CARD_IMG.HEIGHT
+CARD_IMG.tier = CARD_IMG.DEFAULT_TIER  # Used by card_texture, see set_tier
+
+# Built by `crapette.images.build_atlas`, one per tier
+ATLAS_DIR = Path(__file__).parent / "atlas"
+
+
+def tier_path(tier: str) -> Path:
+    return CARD_IMG.DIR / tier
+
+
+def atlas_path(tier: str) -> Path:
+    return ATLAS_DIR / f"cards-{tier}.atlas"
+
+
+def available_tiers() -> list[str]:
+    """Tiers with images or an atlas, from the smallest to the largest."""
+    return [
+        tier
+        for tier in CARD_IMG.TIERS
+        if tier_path(tier).is_dir() or atlas_path(tier).exists()
+    ]
+
+
+def select_tier(card_height: float) -> str:
+    """Smallest tier at least as large as the cards on screen, in pixels."""
+    tiers = available_tiers() or [CARD_IMG.DEFAULT_TIER]
+    for tier in tiers:
+        if CARD_IMG.HEIGHT * CARD_IMG.TIERS[tier] >= card_height:
+            return tier
+    return tiers[-1]
+
+
+def set_tier(tier: str):
+    """Select the tier used by `card_texture`, its textures are loaded on demand.
 
+    The textures of the other tiers are released.
+    """
+    CARD_IMG.tier = tier
+    for textures in (_img_textures, _card_textures):
+        for other_tier in list(textures):
+            if other_tier != tier:
+                del textures[other_tier]
 
-def card2img(card):
+
+def card_img_name(card):
     if card is None:
-        img = "card-base.png"
-    elif not card.face_up:
-        img = "back-navy.png" if card.player == 0 else "back-red.png"
-    else:
-        img = f"{CARD_IMG.SUIT_NAME[card.suit]}_{CARD_IMG.RANK_NAME[card.rank]}.png"
-    return str(CARD_IMG.PATH / img)
+        return "card-base"
+    if not card.face_up:
+        return "back-navy" if card.player == 0 else "back-red"
+    return f"{CARD_IMG.SUIT_NAME[card.suit]}_{CARD_IMG.RANK_NAME[card.rank]}"
 
 
-CARD_IMG.SIZE = CoreImage(card2img(None)).size
-CARD_IMG.WIDTH, CARD_IMG.HEIGHT = CARD_IMG.SIZE
-CARD_IMG.RATIO = CARD_IMG.WIDTH / CARD_IMG.HEIGHT
-CARD_IMG.OFFSET_FACTOR = 0.2  # %
+def card2img(card, tier: str = CARD_IMG.DEFAULT_TIER):
+    return str(tier_path(tier) / f"{card_img_name(card)}.png")
+
+
+# By tier, textures by image name, and by (suit, rank, face_up, player)
+_img_textures: dict[str, dict] = {}
+_card_textures: dict[str, dict] = {}
+
+
+def _load_atlas(tier: str) -> dict:
+    """Load the regions of the card atlas of the tier, if it was built."""
+    img_textures = {}
+    path = atlas_path(tier)
+    if not path.exists():
+        Logger.info("Cards: no atlas in %s, the images are loaded one by one", path)
+        return img_textures
+    with path.open(encoding="utf8") as f:
+        meta = json.load(f)
+    for atlas_img, regions in meta.items():
+        # Same as kivy.atlas.Atlas, but with mipmaps for the downscaled cards
+        texture = CoreImage(str(path.parent / atlas_img), mipmap=True).texture
+        for name, region in regions.items():
+            img_textures[name] = texture.get_region(*region)
+    return img_textures
+
+
+def card_texture(card: Card):
+    """Texture of the card in the current tier, depending on its state.
+
+    The textures are cached, the atlas of the tier is loaded on first use.
+    """
+    tier = CARD_IMG.tier
+    card_textures = _card_textures.get(tier)
+    if card_textures is None:
+        card_textures = _card_textures[tier] = {}
+        _img_textures[tier] = _load_atlas(tier)
+
+    key = (card.suit, card.rank, card.face_up, card.player)
+    texture = card_textures.get(key)
+    if texture is None:
+        img_textures = _img_textures[tier]
+        name = card_img_name(card)
+        texture = img_textures.get(name)
+        if texture is None:
+            texture = CoreImage(card2img(card, tier), mipmap=True).texture
+            img_textures[name] = texture
+        card_textures[key] = texture
+    return texture
+
+
+def iter_preload_card_textures():
+    """Fill the texture cache of the current tier, yield after each texture.
+
+    Used to load the textures between the frames, see
+    `CrapetteApp.preload_card_textures`.
+    """
+    for player in Card.PLAYERS:
+        for suit in Card.SUITS:
+            for rank in Card.RANKS:
+                card = Card(rank, suit, player)
+                for face_up in (False, True):
+                    card.face_up = face_up
+                    card_texture(card)
+                    yield
@@ -0,0 +1,117 @@
+"""Optional profiling of the AI hot functions.
+
+By default `profile` returns the decorated function unchanged, so there is no
+overhead. A profiling mode can be chosen at startup with the `CRAPETTE_PROFILE`
+environment variable:
+
+- `line`: line by line timings of the decorated functions, needs `line_profiler`
+- `cprofile`: cProfile statistics of the whole run
+- `sampling`: statistical profiling of the whole run, by sampling the call stacks
+- `counters`: number of calls of the decorated functions
+
+The report is printed at exit.
+"""
+
+import atexit
+import collections
+import functools
+import os
+import sys
+import threading
+
+MODES = ("", "line", "cprofile", "sampling", "counters")
+PROFILE_MODE = os.environ.get("CRAPETTE_PROFILE", "")
+if PROFILE_MODE not in MODES:
+    raise ValueError(
+        f"Unknown CRAPETTE_PROFILE {PROFILE_MODE}, expected one of {MODES}"
+    )
+
+SAMPLING_INTERVAL = 0.001  # s
+NB_PRINTED_STATS = 30
+
+
+def _identity(func):
+    return func
+
+
+def _line_profile():
+    from line_profiler import LineProfiler  # noqa: PLC0415
+
+    line_profiler = LineProfiler()
+    atexit.register(line_profiler.print_stats)
+    return line_profiler
+
+
+def _cprofile():
+    import cProfile  # noqa: PLC0415
+    import pstats  # noqa: PLC0415
+
+    profiler = cProfile.Profile()
+
+    def print_stats():
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats("tottime").print_stats(NB_PRINTED_STATS)
+
+    atexit.register(print_stats)
+    profiler.enable()
+    return _identity
+
+
+def _sampling():
+    main_thread_id = threading.main_thread().ident
+    samples = collections.Counter()
+    stop = threading.Event()
+
+    def sample():
+        while not stop.wait(SAMPLING_INTERVAL):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == threading.get_ident():
+                    continue
+                code = frame.f_code
+                thread = "main" if thread_id == main_thread_id else thread_id
+                samples[
+                    thread, code.co_filename, code.co_firstlineno, code.co_name
+                ] += 1
+
+    def print_stats():
+        stop.set()
+        total = samples.total() or 1
+        print(f"{total} samples, every {SAMPLING_INTERVAL}s")
+        for (thread, filename, lineno, name), count in samples.most_common(
+            NB_PRINTED_STATS
+        ):
+            print(f"{count / total:6.1%} [{thread}] {name} ({filename}:{lineno})")
+
+    atexit.register(print_stats)
+    threading.Thread(target=sample, name="ProfilingSampler", daemon=True).start()
+    return _identity
+
+
+def _counters():
+    calls = collections.Counter()
+
+    def print_stats():
+        for name, count in calls.most_common():
+            print(f"{count:12d} {name}")
+
+    def counted(func):
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    atexit.register(print_stats)
+    return counted
+
+
+profile = {
+    "": lambda: _identity,
+    "line": _line_profile,
+    "cprofile": _cprofile,
+    "sampling": _sampling,
+    "counters": _counters,
+}[PROFILE_MODE]()
@@ -0,0 +1,174 @@
+"""Headless AI-vs-AI games, to evaluate the AI on many deals.
+
+Usage: python -m crapette.simulate --games 100 --jobs 4 --output stats.jsonl
+"""
+
+import argparse
+import concurrent.futures
+import dataclasses
+import json
+import random
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+from .brain.config import BrainConfig, add_brain_arguments, brain_config_from_args
+from .brain.engines import new_brain
+from .core.game_config import GameConfig
+from .core.moves import Flip, FlipWaste, Move
+from .core.piles import WastePile
+
+
+@dataclasses.dataclass
+class GameStats:
+    seed: int | None
+    winner: int | None = None
+    turns: int = 0
+    moves: int = 0
+    nodes_expanded: int = 0
+    ai_times: list[float] = dataclasses.field(default_factory=list)  # s, per turn
+    duration: float = 0  # s
+
+
+def new_headless_game(seed: int) -> GameConfig:
+    """Create a game between two AIs, dealt as in the GUI."""
+    game_config = GameConfig(player_types=("ai", "ai"), seed=seed)
+    random.seed(seed)
+    game_config.board.new_game(game_config)
+    game_config.active_player = game_config.board.compute_first_player()
+    return game_config
+
+
+def play_turn(
+    game_config: GameConfig,
+    ai_config: BrainConfig,
+    stats: GameStats,
+    played_moves: list | None = None,
+    on_move: Callable[[Move | Flip | FlipWaste], None] | None = None,
+):
+    """Play the turn of the active player, like `GameManager` does.
+
+    The moves are appended to `played_moves` if given, encoded by `Board.encode_move`.
+    `on_move` is called after each move, with the board after this move.
+    Returns True if the game is over, either won or stalled.
+    """
+    board = game_config.board
+    player = game_config.active_player
+    ai_time = 0
+    try:
+        while True:
+            brain = new_brain(game_config, ai_config)
+            start_time = timeit.default_timer()
+            moves = brain.compute_states()
+            ai_time += timeit.default_timer() - start_time
+            stats.nodes_expanded += getattr(brain, "nb_nodes_visited", 0)
+
+            board_before = board.to_bytes()
+            for move in moves:
+                if played_moves is not None:
+                    played_moves.append(board.encode_move(move))
+                board.play_move(move, player)
+                game_config.step += 1
+                stats.moves += 1
+                if on_move is not None:
+                    on_move(move)
+
+                if board.check_win(player):
+                    stats.winner = player
+                    return True
+
+                if (
+                    isinstance(move, Move)
+                    and isinstance(move.destination, WastePile)
+                    and move.destination.player == player
+                ):
+                    game_config.active_player = 1 - player
+                    return False
+
+            if board.to_bytes() == board_before:
+                return True  # Stalled, the AI can't do anything
+    finally:
+        stats.ai_times.append(ai_time)
+        stats.turns += 1
+
+
+def play_game(seed: int, ai_config: BrainConfig, max_turns: int) -> GameStats:
+    """Play a full game without GUI and return its statistics."""
+    stats = GameStats(seed)
+    start_time = timeit.default_timer()
+    game_config = new_headless_game(seed)
+    while stats.turns < max_turns and not play_turn(game_config, ai_config, stats):
+        pass
+    stats.duration = timeit.default_timer() - start_time
+    return stats
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="crapette.simulate", description="Play AI-vs-AI games without GUI"
+    )
+    parser.add_argument(
+        "-n", "--games", type=int, default=10, help="Number of games to play."
+    )
+    parser.add_argument(
+        "-s",
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the first game, the next games use the following seeds.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of processes, defaults to the number of CPUs.",
+    )
+    parser.add_argument(
+        "--max-turns",
+        type=int,
+        default=1000,
+        help="Stop a game without winner after this number of turns.",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="JSON lines file for the game statistics."
+    )
+    add_brain_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    ai_config = brain_config_from_args(args)
+    seeds = range(args.seed, args.seed + args.games)
+
+    wins = [0, 0]
+    start_time = timeit.default_timer()
+    output = args.output.open("w", encoding="utf8") if args.output else None
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            for stats in executor.map(
+                play_game,
+                seeds,
+                [ai_config] * args.games,
+                [args.max_turns] * args.games,
+            ):
+                if stats.winner is not None:
+                    wins[stats.winner] += 1
+                if output is not None:
+                    output.write(json.dumps(dataclasses.asdict(stats)) + "\n")
+    finally:
+        if output is not None:
+            output.close()
+    elapsed = timeit.default_timer() - start_time
+
+    print(
+        f"{args.games} games in {elapsed:.1f}s ({args.games / elapsed:.2f} games/s)",
+        f"wins: player 0 {wins[0]}, player 1 {wins[1]},",
+        f"no winner {args.games - sum(wins)}",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import typing
+from collections.abc import Collection
 
 from kivy.animation import Animation
 from kivy.app import App
@@ -7,8 +8,10 @@ from kivy.core.window import Window
 from kivy.uix.boxlayout import BoxLayout
 
 from crapette.core.piles import Pile
+from crapette.images.card_data import card_texture
 
 from .card_widget import DEFAULT_FLIP_DURATION, DEFAULT_MOVE_DURATION, CardWidget
+from .pile_index import PileIndex
 from .pile_widgets import PileWidget
 
 if typing.TYPE_CHECKING:
@@ -24,6 +27,8 @@ class BoardWidget(BoxLayout):
 
         self.pile_widgets: list[PileWidget] = []
         self.card_widgets: dict[Card, CardWidget] = {}
+        # All the card widgets ever created, by (rank, suit, player)
+        self.card_widgets_pool: dict[tuple[int, str, int], CardWidget] = {}
 
         self.game_config = None
         self._do_layout_event = None
@@ -32,6 +37,15 @@ class BoardWidget(BoxLayout):
         self.crape_widgets = []
         self.waste_widgets = []
 
+        # Piles changed since the last frame, see `mark_dirty`
+        self._dirty_counts: set[PileWidget] = set()
+        self._refresh_trigger = Clock.create_trigger(self.refresh)
+        self.pile_index: PileIndex | None = None
+
+        # Highlight of the cards the player can move, with the "h" key
+        self.show_hints = False
+        self._hinted_widgets: list[CardWidget] = []
+
     def do_layout(self, *args, **kwargs):
         """Delay the layout computing to avoid visual lag."""
         if self._do_layout_event is not None:
@@ -43,6 +57,7 @@ class BoardWidget(BoxLayout):
             super_do_layout(*args, **kwargs)
 
             self.place_cards()
+            self.build_pile_index()
             if self.game_config:
                 # with contextlib.suppress(KeyError):  # KeyError on window initialization
                 self.place_background_halo()
@@ -61,6 +76,7 @@ class BoardWidget(BoxLayout):
         self.setup_piles()
         self.setup_card_widgets()
         self.place_cards()
+        self.build_pile_index()
         self.update_counts()
         self.init_keyboard()
 
@@ -92,6 +108,21 @@ class BoardWidget(BoxLayout):
             self.ids[f"foundation{foundation}"].set_pile(foundation_pile)
         self._piles_widgets_name_cache = {p.pile.name: p for p in self.pile_widgets}
 
+    def build_pile_index(self):
+        """Index the pile regions, the layout must be up to date."""
+        if not self.pile_widgets:
+            return
+        self.pile_index = PileIndex(self.app.card_width, self.app.card_height)
+        for pile_widget in self.pile_widgets:
+            self.pile_index.add(pile_widget, pile_widget.drop_rect())
+
+    def pile_widget_at(self, center: tuple[float, float]) -> PileWidget | None:
+        """Pile overlapping the most with a card centered on this position."""
+        width, height = self.app.card_width, self.app.card_height
+        return self.pile_index.best_overlap(
+            (center[0] - width / 2, center[1] - height / 2, width, height)
+        )
+
     def widget_from_pile(self, pile: Pile):
         return self._piles_widgets_name_cache[pile.name]
 
@@ -100,22 +131,41 @@ class BoardWidget(BoxLayout):
 
         Updates the `card_widgets` list.
 
+        The widgets of the previous game are reused, since creating them is slow,
+        see `card_widgets_pool`.
+
         The cards are not placed on the board, see `place_cards`.
         """
         cards_layer = self.ids["cards_layer"]
-        # Remove previous card widgets
-        if self.card_widgets:
-            for card_widget in self.card_widgets.values():
-                cards_layer.remove_widget(card_widget)
+        previous_widgets = set(self.card_widgets.values())
 
         # Add all card widgets
         self.card_widgets = {}
         for pile_widget in self.pile_widgets:
             for card in pile_widget.pile:
-                card_widget = CardWidget(card, self.game_manager)
+                key = (card.rank, card.suit, card.player)
+                card_widget = self.card_widgets_pool.get(key)
+                if card_widget is None:
+                    card_widget = CardWidget(card, self.game_manager)
+                    self.card_widgets_pool[key] = card_widget
+                else:
+                    card_widget.set_card(card, self.game_manager)
                 card_widget.pile_widget = pile_widget
                 self.card_widgets[card] = card_widget
-                cards_layer.add_widget(card_widget)
+                if card_widget.parent is None:
+                    cards_layer.add_widget(card_widget)
+
+        # Remove the widgets of the cards not in this game
+        for card_widget in previous_widgets.difference(self.card_widgets.values()):
+            cards_layer.remove_widget(card_widget)
+
+        # Stack the cards in the pile order
+        self.put_on_top(*self.card_widgets.values())
+
+    def update_card_images(self):
+        """Show the card images again, after a change of resolution."""
+        for card_widget in self.card_widgets.values():
+            card_widget.update_image()
 
     def init_keyboard(self):
         self._keyboard = Window.request_keyboard(
@@ -126,6 +176,63 @@ class BoardWidget(BoxLayout):
         )
         self._keyboard.bind(on_key_down=self._on_keyboard_down)
 
+    def sync_cards(self):
+        """Show all the cards as they are on the board, without animation.
+
+        Used after changing the board directly, see `GameManager.fast_forward`.
+        """
+        card_widgets = []
+        for pile_widget in self.pile_widgets:
+            for card in pile_widget.pile:
+                card_widget = self.card_widgets[card]
+                card_widget.pile_widget = pile_widget
+                card_widget.update_image()
+                card_widget.rotation = card_widget.random_rotation()
+                card_widgets.append(card_widget)
+        self.put_on_top(*card_widgets)
+        self.place_cards()
+        self.update_counts()
+
+    def mark_dirty(self, *pile_widgets: PileWidget):
+        """Update the card counts at the next frame, once even if marked several times.
+
+        The card positions are not updated: the card widgets are animated to
+        their pile, and a card position only depends on its index in the pile.
+        """
+        self._dirty_counts.update(pile_widgets)
+        self._refresh_trigger()
+
+    def refresh(self, _dt=None):
+        """Update the piles marked with `mark_dirty`, and the hints."""
+        if self._dirty_counts:
+            self.update_counts(self._dirty_counts)
+            self._dirty_counts = set()
+        self.update_hints()
+
+    def toggle_hints(self):
+        self.show_hints = not self.show_hints
+        self.update_hints()
+
+    def update_hints(self):
+        """Highlight the cards that the human player can move or flip.
+
+        The moves are not searched, they are read from `GameManager.legal_moves`.
+        """
+        for card_widget in self._hinted_widgets:
+            card_widget.hinted = False
+        self._hinted_widgets = []
+
+        player = self.game_config.active_player
+        if not self.show_hints or player is None or self.game_config.is_player_ai:
+            return
+        legal_moves = self.game_manager.legal_moves
+        cards = [pile.top_card for pile in legal_moves.playable_piles(player)]
+        cards.extend(flip.card for flip in legal_moves.flips(player))
+        for card in cards:
+            card_widget = self.card_widgets[card]
+            card_widget.hinted = True
+            self._hinted_widgets.append(card_widget)
+
     def place_cards(self):
         """Reset the card widget positions in the piles."""
         for pile_widget in self.pile_widgets:
@@ -133,42 +240,51 @@ class BoardWidget(BoxLayout):
                 card_widget = self.card_widgets[card]
                 card_widget.center = pile_widget.card_pos(index)
 
-    def update_counts(self):
-        """Update displayed card counts."""
+    def update_counts(self, pile_widgets: Collection[PileWidget] | None = None):
+        """Update displayed card counts of the piles, by default of all piles."""
+        if pile_widgets is None:
+            pile_widgets = self.pile_widgets
         for player in range(self.board.NB_PLAYERS):
-            nb_stock = len(self.stock_widgets[player].pile)
-            nb_waste = len(self.waste_widgets[player].pile)
-            stock_label = self.ids[f"player{player}stockcount"]
-            stock_label.text = f"{nb_stock}+{nb_waste}" if nb_stock or nb_waste else ""
-
-            crape_pile = self.crape_widgets[player].pile
-            crape_label = self.ids[f"player{player}crapecount"]
-            if crape_pile:
-                cards_up = len([c for c in crape_pile if c.face_up])
-                cards_down = len(crape_pile) - cards_up
-                crape_label.text = (
-                    f"{cards_down}+{cards_up}" if cards_up else str(cards_down)
+            stock_widget = self.stock_widgets[player]
+            waste_widget = self.waste_widgets[player]
+            crape_widget = self.crape_widgets[player]
+            if stock_widget in pile_widgets or waste_widget in pile_widgets:
+                nb_stock = len(stock_widget.pile)
+                nb_waste = len(waste_widget.pile)
+                stock_label = self.ids[f"player{player}stockcount"]
+                stock_label.text = (
+                    f"{nb_stock}+{nb_waste}" if nb_stock or nb_waste else ""
                 )
-            else:
-                crape_label.text = ""
+
+            if crape_widget in pile_widgets:
+                crape_pile = crape_widget.pile
+                crape_label = self.ids[f"player{player}crapecount"]
+                if crape_pile:
+                    cards_up = sum(c.face_up for c in crape_pile)
+                    cards_down = len(crape_pile) - cards_up
+                    crape_label.text = (
+                        f"{cards_down}+{cards_up}" if cards_up else str(cards_down)
+                    )
+                else:
+                    crape_label.text = ""
 
     def move_card(
         self,
         card_widget: CardWidget,
         pile_widget: PileWidget,
         duration=DEFAULT_MOVE_DURATION,
+        delay=0,
     ):
-        """Low level card move."""
+        """Low level card move, the animation starts after `delay`."""
         self.put_on_top(card_widget)
 
         # Remove from previous pile
+        self.mark_dirty(card_widget.pile_widget, pile_widget)
         card_widget.pile_widget.pop_card()
 
         # Add to new pile
         pile_widget.add_card_widget(card_widget)
-        card_widget.animate_move_to_pile(duration)
-
-        self.update_counts()
+        card_widget.animate_move_to_pile(duration, delay)
 
     def set_active_player(self):
         """Change the active player and updates the GUI accordingly."""
@@ -188,6 +304,7 @@ class BoardWidget(BoxLayout):
             ).start(prev_player_btn)
 
         self.place_background_halo()
+        self._refresh_trigger()  # Hints of the new player
 
     def update_crapette_button_status(self):
         if self.game_config.active_player is None:
@@ -212,45 +329,76 @@ class BoardWidget(BoxLayout):
             transition="in_out_expo",
         ).start(background_halo)
 
-    def flip_card_up(self, card_widget: CardWidget, duration=DEFAULT_FLIP_DURATION):
-        """Flips up the card widget."""
-        card_widget.set_face_up(duration)
-        self.update_counts()
+    def flip_card_up(
+        self, card_widget: CardWidget, duration=DEFAULT_FLIP_DURATION, delay=0
+    ):
+        """Flips up the card widget, the animation starts after `delay`."""
+        card_widget.set_face_up(duration, delay)
+        self.mark_dirty(card_widget.pile_widget)
 
     def flip_pile(self, pile_widget: PileWidget):
         # Update cards
+        card_widgets = []
         for card in pile_widget.pile:
             card.face_up = not card.face_up
             card_widget = self.card_widgets[card]
             card_widget.update_image()
-            self.put_on_top(card_widget)
-        self.update_counts()
+            card_widgets.append(card_widget)
+        self.put_on_top(*card_widgets)
+        self.mark_dirty(pile_widget)
+
+    def flip_waste_to_stock(self, duration=DEFAULT_MOVE_DURATION, delay=0):
+        """When the stock is empty, flip the waste back to the stock.
 
-    def flip_waste_to_stock(self):
-        """When the stock is empty, flip the waste back to the stock."""
+        The animation starts after `delay`.
+        """
         player = self.game_config.active_player
         stock_widget = self.stock_widgets[player]
         waste_widget = self.waste_widgets[player]
 
         # Update model
-        stock_widget.pile.set_cards(waste_widget.pile[::-1])
-        waste_widget.pile.clear()
+        self.board.flip_waste_to_stock(player)
 
         # Update cards
+        card_widgets = []
         for card in stock_widget.pile:
-            card.face_up = False
             card_widget = self.card_widgets[card]
-            card_widget.update_image()
             card_widget.pile_widget = stock_widget
-            card_widget.animate_move_to_pile()
-            self.put_on_top(card_widget)
-        self.update_counts()
+            card_widget.animate_move_to_pile(duration, delay)
+            card_widgets.append(card_widget)
+        self.put_on_top(*card_widgets)
+
+        # The textures are chosen now, the cards may be flipped again before the delay
+        textures = [card_texture(card_widget.card) for card_widget in card_widgets]
+
+        def show_backs(_dt=None):
+            for card_widget, texture in zip(card_widgets, textures, strict=True):
+                card_widget.texture = texture
+
+        if delay:
+            Clock.schedule_once(show_backs, delay)
+        else:
+            show_backs()
+        self.mark_dirty(stock_widget, waste_widget)
+
+    def put_on_top(self, *card_widgets: CardWidget):
+        """Put card widgets above the other cards on the board widget.
 
-    def put_on_top(self, card_widget: CardWidget):
-        """Put a card widget above the other cards on the board widget."""
+        The last card widget is on top. The widgets are not removed from
+        `cards_layer`, which would be slow: only the drawing order is changed.
+        """
         cards_layer = self.ids["cards_layer"]
-        cards_layer.remove_widget(card_widget)
-        cards_layer.add_widget(card_widget)
+        canvas = cards_layer.canvas
+        for card_widget in card_widgets:
+            canvas.remove(card_widget.canvas)
+            canvas.add(card_widget.canvas)
+
+        # Also reorder the children for the touch events, first is on top,
+        # with a single update of the property
+        moved = set(card_widgets)
+        cards_layer.children = [*card_widgets[::-1]] + [
+            child for child in cards_layer.children if child not in moved
+        ]
 
     def _keyboard_closed(self):
         self._keyboard.unbind(on_key_down=self._on_keyboard_down)
@@ -263,6 +411,15 @@ class BoardWidget(BoxLayout):
             # the system.
             self.game_manager.toggle_crapette_mode()
             return True
+        if keycode[1] == "s":
+            self.game_manager.save_snapshot()
+            return True
+        if keycode[1] == "f":
+            self.game_manager.toggle_fast_forward()
+            return True
+        if keycode[1] == "h":
+            self.toggle_hints()
+            return True
         # TODO: on game end: keyboard.release()
         return False
 
@@ -277,3 +434,4 @@ class BoardWidget(BoxLayout):
         else:
             background_crapette.opacity = 0
             crapette_button.text = "Crapette !"
+        self._refresh_trigger()  # Hints
@@ -7,12 +7,12 @@ from kivy.animation import Animation
 from kivy.app import App
 from kivy.core.window import Window
 from kivy.logger import Logger
-from kivy.properties import StringProperty
+from kivy.properties import BooleanProperty, ObjectProperty
 from kivy.uix.scatterlayout import ScatterLayout
 
 from crapette.core.cards import Card
 from crapette.core.piles import WastePile
-from crapette.images.card_data import card2img
+from crapette.images.card_data import card_texture
 
 if typing.TYPE_CHECKING:
     from .pile_widgets import PileWidget
@@ -26,11 +26,21 @@ DEFAULT_FLIP_DURATION = 0.3  # s
 class CardWidget(ScatterLayout):
     """Widget representing a card on the board."""
 
-    source = StringProperty()
+    texture = ObjectProperty()
+    hinted = BooleanProperty(False)  # See BoardWidget.update_hints
 
     def __init__(self, card: Card, game_manager: "GameManager"):
+        self.set_card(card, game_manager)
+
+        # At the end so that repr() works in the kivy initalization
+        super().__init__()
+
+    def set_card(self, card: Card, game_manager: "GameManager"):
+        """Bind the widget to a card, also used to reuse the widget in a new game."""
+        Animation.cancel_all(self)
         self.card = card
-        self.source = card2img(card)
+        self.texture = card_texture(card)
+        self.hinted = False
         self.game_manager = game_manager
         self.game_config = game_manager.game_config
 
@@ -39,26 +49,37 @@ class CardWidget(ScatterLayout):
         self._flipping = False
         self.main_rotation = 0
 
-        # At the end so that repr() works in the kivy initalization
-        super().__init__()
+        # The animations were cancelled, reset the state of the previous game
+        app = App.get_running_app()
+        self.size = (app.card_width, app.card_height)
+        self.rotation = 0
+        self.do_translation = True  # Disabled at the end of the game
 
     def __repr__(self):
         return f"CardWidget({self.card!r})"
 
-    def animate_move_to_pile(self, duration=DEFAULT_MOVE_DURATION):
+    def animate_move_to_pile(self, duration=DEFAULT_MOVE_DURATION, delay=0):
         """Animate a card on the board to move to its pile.
 
         It also applies a random rotation error, as if the card was put manually.
+        The animation starts after `delay`, and the card is moved at once if
+        both are 0.
 
         This is only a visual effect, this function doesn't change
         the state of the game.
         """
+        if duration == 0 and delay == 0:
+            self.center = self.pile_widget.card_pos()
+            self.rotation = self.random_rotation()
+            return
         animation = Animation(
             center=self.pile_widget.card_pos(),
             duration=duration,
             transition="out_quad",
         )
         animation &= self.random_rotation_animation_factory(duration)
+        if delay:
+            animation = Animation(duration=delay) + animation
         animation.start(self)
 
     def update_image(self):
@@ -69,30 +90,37 @@ class CardWidget(ScatterLayout):
         This is only a visual effect, this function doesn't change
         the state of the game.
         """
-        self.source = card2img(self.card)
+        self.texture = card_texture(self.card)
 
-    def random_rotation_animation_factory(self, duration=DEFAULT_MOVE_DURATION):
-        """Create an Animation to display the card with a random rotation error.
+    def random_rotation(self) -> float:
+        """Rotation of the pile, with a random error.
 
         It's just for fun, to make it look like the card was placed by hand on the board,
         not perfectly aligned.
-
-        This is only a visual effect, this function doesn't change
-        the state of the game.
         """
         angle = self.pile_widget.rotation
         angle += random.triangular(-MAX_RANDOM_ANGLE, MAX_RANDOM_ANGLE)
         if self.rotation > 180:
             angle += 360
-        return Animation(rotation=angle, duration=duration, transition="out_sine")
+        return angle
 
-    def set_face_up(self, duration=DEFAULT_FLIP_DURATION):
+    def random_rotation_animation_factory(self, duration=DEFAULT_MOVE_DURATION):
+        """Create an Animation to display the card with a random rotation error.
+
+        This is only a visual effect, this function doesn't change
+        the state of the game.
+        """
+        return Animation(
+            rotation=self.random_rotation(), duration=duration, transition="out_sine"
+        )
+
+    def set_face_up(self, duration=DEFAULT_FLIP_DURATION, delay=0):
         """Flip the card so that the face is up.
 
         This changes the underlying card model accordingly.
         """
         self.card.face_up = True
-        self.flip_animation(duration)
+        self.flip_animation(duration, delay)
 
     def set_face_down(self, duration=DEFAULT_FLIP_DURATION):
         """Flip the card so that the face is down.
@@ -102,12 +130,20 @@ class CardWidget(ScatterLayout):
         self.card.face_up = False
         self.flip_animation(duration)
 
-    def flip_animation(self, duration=DEFAULT_FLIP_DURATION):
+    def flip_animation(self, duration=DEFAULT_FLIP_DURATION, delay=0):
         """Animate a card flip.
 
+        The animation starts after `delay`, and the card is flipped at once if
+        both are 0.
+
         This is only a visual effect, this function doesn't change
         the state of the game.
         """
+        if duration == 0 and delay == 0:
+            self.update_image()
+            self.rotation = self.random_rotation()
+            return
+
         # Save state
         height = self.height
         center = self.center
@@ -129,6 +165,8 @@ class CardWidget(ScatterLayout):
             & Animation(center=center, duration=duration_in, transition="in_sine")
             & self.random_rotation_animation_factory(DEFAULT_FLIP_DURATION)
         )
+        if delay:
+            animation = Animation(duration=delay) + animation
         animation.start(self)
 
     @property
@@ -180,6 +218,7 @@ class CardWidget(ScatterLayout):
 
         if self.card.face_up:
             self._moving = True
+            self.game_manager.board_widget.put_on_top(self)
             self.start_moving_animation()
             return super().on_touch_down(touch)
 
@@ -208,10 +247,7 @@ class CardWidget(ScatterLayout):
         self.finish_moving_animation()
 
         # Look for the pile the card was dropped on
-        pile_widget = None
-        for pile_widget in self.game_manager.board_widget.pile_widgets:
-            if pile_widget.collide_point(*self.center):
-                break
+        pile_widget = self.game_manager.board_widget.pile_widget_at(self.center)
 
         if pile_widget is None:
             Logger.debug("%s not dropped on a pile, return it", self.card)
@@ -0,0 +1,58 @@
+"""Spatial index of the pile regions, to find where a card is dropped."""
+
+import collections
+import math
+from collections.abc import Hashable
+
+# x, y, width, height
+Rect = tuple[float, float, float, float]
+
+
+def overlap_area(rect1: Rect, rect2: Rect) -> float:
+    x1, y1, w1, h1 = rect1
+    x2, y2, w2, h2 = rect2
+    width = min(x1 + w1, x2 + w2) - max(x1, x2)
+    height = min(y1 + h1, y2 + h2) - max(y1, y2)
+    return width * height if width > 0 and height > 0 else 0
+
+
+class PileIndex:
+    """Regions of the piles, bucketed in a grid of cells of the size of a card.
+
+    A card overlaps at most 4 cells, so a lookup only tests the few piles
+    registered in these cells.
+    """
+
+    def __init__(self, cell_width: float, cell_height: float):
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self._cells: dict[tuple[int, int], list[tuple[Hashable, Rect]]] = (
+            collections.defaultdict(list)
+        )
+
+    def _cells_of(self, rect: Rect):
+        x, y, width, height = rect
+        for i in range(
+            math.floor(x / self.cell_width), math.ceil((x + width) / self.cell_width)
+        ):
+            for j in range(
+                math.floor(y / self.cell_height),
+                math.ceil((y + height) / self.cell_height),
+            ):
+                yield i, j
+
+    def add(self, item: Hashable, rect: Rect):
+        for cell in self._cells_of(rect):
+            self._cells[cell].append((item, rect))
+
+    def best_overlap(self, rect: Rect) -> Hashable | None:
+        """Item whose region overlaps the most with the rectangle, if any."""
+        best_item = None
+        best_area = 0
+        for cell in self._cells_of(rect):
+            for item, item_rect in self._cells.get(cell, ()):
+                area = overlap_area(rect, item_rect)
+                if area > best_area:
+                    best_item = item
+                    best_area = area
+        return best_item
@@ -2,6 +2,7 @@
 
 It's mostly used for positionning the cards on the board.
 """
+
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
@@ -19,6 +20,7 @@ if TYPE_CHECKING:
     from crapette import crapette
 
     from .card_widget import CardWidget
+    from .pile_index import Rect
 
 
 class PileWidget(RelativeLayout):
@@ -48,6 +50,16 @@ class PileWidget(RelativeLayout):
         center: tuple[float, float] = self.center
         return center
 
+    def drop_rect(self) -> Rect:
+        """Region where the cards are shown, to detect drops, see `PileIndex`."""
+        app: crapette.CrapetteApp = App.get_running_app()
+        return (
+            self.center_x - app.card_width / 2,
+            self.center_y - app.card_height / 2,
+            app.card_width,
+            app.card_height,
+        )
+
     def pop_card(self):
         """Remove a card from the top of pile."""
         self.pile.pop_card()
@@ -66,6 +78,18 @@ class FoundationPileWidget(PileWidget):
 
     background = StringProperty()
 
+    def drop_rect(self) -> Rect:
+        if self.rotation % 180 == 0:
+            return super().drop_rect()
+        # The card is shown sideways
+        app: crapette.CrapetteApp = App.get_running_app()
+        return (
+            self.center_x - app.card_height / 2,
+            self.center_y - app.card_width / 2,
+            app.card_height,
+            app.card_width,
+        )
+
     def add_card_widget(self, card_widget: CardWidget):
         super().add_card_widget(card_widget)
 
@@ -132,6 +156,16 @@ class TableauPileWidget(PileWidget):
         app: crapette.CrapetteApp = App.get_running_app()
         return app.card_width * (0.5 + CARD_IMG.OFFSET_FACTOR * index)
 
+    def drop_rect(self) -> Rect:
+        # The cards are spread over the whole width
+        app: crapette.CrapetteApp = App.get_running_app()
+        return (
+            self.x,
+            self.center_y - app.card_height / 2,
+            self.width,
+            app.card_height,
+        )
+
 
 class TableauLeftPileWidget(TableauPileWidget):
     def pos_anchor(self, i_card: int) -> float:
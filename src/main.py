@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 """Basic wrapper to start the crapette game."""
 
+import multiprocessing
 import sys
 
 if __name__ == "__main__":
+    # The AI worker process re-runs this script in the frozen executable,
+    # see crapette.brain.worker
+    multiprocessing.freeze_support()
+
     # Workaround : do not let kivy use the command line arguments
     # To be done before the following import
     args = sys.argv[1:]
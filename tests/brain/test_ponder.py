@@ -0,0 +1,59 @@
+import concurrent.futures
+
+from crapette.brain.config import BrainConfig
+from crapette.brain.ponder import Ponderer, expected_position
+from crapette.brain.positions import position_key
+from crapette.brain.worker import AIWorker
+from crapette.simulate import new_headless_game
+
+
+def test_expected_position():
+    game_config = new_headless_game(seed=3)
+    player = game_config.active_player
+    stock = game_config.board.players_piles[player].stock
+    card = stock.top_card
+
+    expected = expected_position(game_config)
+    assert expected.active_player == 1 - player
+    assert expected.step == game_config.step + 1
+    expected_piles = expected.board.players_piles[player]
+    assert len(expected_piles.stock) == len(stock) - 1
+    assert expected_piles.waste.top_card == card
+    assert expected_piles.waste.top_card.face_up
+    # The current board is not changed
+    assert stock.top_card is card
+
+    stock.clear()
+    assert expected_position(game_config) is None
+
+
+def test_lookup_hit():
+    game_config = new_headless_game(seed=3)
+    worker = AIWorker(use_process=False)
+    ponderer = Ponderer(worker)
+    try:
+        ponderer.ponder(game_config, BrainConfig())
+        expected = expected_position(game_config)
+        future = ponderer.lookup(expected)
+        assert future is not None
+        assert future.result().moves
+        assert ponderer.lookup(expected) is future
+    finally:
+        worker.shutdown()
+
+
+def test_lookup_stale_and_failed():
+    game_config = new_headless_game(seed=3)
+    ponderer = Ponderer(AIWorker(use_process=False))
+    key = position_key(game_config)
+
+    # Still running, but not the current request of the worker
+    ponderer._cache[key] = concurrent.futures.Future()
+    assert ponderer.lookup(game_config) is None
+    assert key not in ponderer._cache
+
+    failed = concurrent.futures.Future()
+    failed.set_exception(RuntimeError("search failed"))
+    ponderer._cache[key] = failed
+    assert ponderer.lookup(game_config) is None
+    assert key not in ponderer._cache
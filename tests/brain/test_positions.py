@@ -0,0 +1,30 @@
+from crapette.brain.brainforce import BrainForce
+from crapette.brain.config import BrainConfig
+from crapette.brain.positions import open_database
+from crapette.simulate import new_headless_game
+
+
+def _compute_moves(ai_config):
+    game_config = new_headless_game(seed=3)
+    brain = BrainForce(game_config, ai_config)
+    moves = brain.compute_states()
+    return [game_config.board.encode_move(move) for move in moves], brain.stats
+
+
+def test_database_hit(tmp_path):
+    ai_config = BrainConfig(position_db=str(tmp_path / "positions.sqlite"))
+    moves, stats = _compute_moves(ai_config)
+    assert stats.termination != "database"
+    assert len(open_database(ai_config.position_db)) == 1
+
+    moves_cached, stats = _compute_moves(ai_config)
+    assert stats.termination == "database"
+    assert moves_cached == moves
+
+
+def test_database_config(tmp_path):
+    path = str(tmp_path / "positions.sqlite")
+    _compute_moves(BrainConfig(position_db=path))
+    _, stats = _compute_moves(BrainConfig(position_db=path, shortcut=False))
+    assert stats.termination != "database"
+    assert len(open_database(path)) == 2
@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+from crapette.brain import worker as worker_module
+from crapette.brain.brainforce import BrainDijkstra
+from crapette.brain.config import BrainConfig, SearchCancelledError
+from crapette.brain.engines import new_brain
+from crapette.brain.worker import AIWorker
+from crapette.simulate import new_headless_game
+
+
+def test_trace_in_game_log_dir(tmp_path):
+    game_config = new_headless_game(seed=3)
+    game_config.log_path = tmp_path / "game.txt"
+    worker = AIWorker(use_process=False)
+    try:
+        worker.submit(game_config, BrainConfig(trace=True)).result()
+    finally:
+        worker.shutdown()
+    assert (tmp_path / "game" / f"trace_{game_config.step:04d}.bin").exists()
+
+
+def test_submit_makes_previous_request_stale(monkeypatch):
+    # The first request only starts once the second one is submitted
+    started = threading.Event()
+    monkeypatch.setattr(BrainDijkstra, "CANCEL_CHECK_PERIOD", 1)
+
+    def wait_new_brain(*args):
+        started.wait(timeout=10)
+        return new_brain(*args)
+
+    monkeypatch.setattr(worker_module, "new_brain", wait_new_brain)
+    game_config = new_headless_game(seed=3)
+    worker = AIWorker(use_process=False)
+    try:
+        first = worker.submit(game_config, BrainConfig())
+        second = worker.submit(game_config, BrainConfig())
+        assert not worker.is_current(first)
+        assert worker.is_current(second)
+        started.set()
+        with pytest.raises(SearchCancelledError):
+            first.result(timeout=10)
+        assert second.result(timeout=10).moves
+    finally:
+        started.set()
+        worker.shutdown()
+
+
+def test_cancel_makes_current_request_stale():
+    game_config = new_headless_game(seed=3)
+    worker = AIWorker(use_process=False)
+    try:
+        future = worker.submit(game_config, BrainConfig())
+        assert worker.is_current(future)
+        worker.cancel()
+        assert not worker.is_current(future)
+    finally:
+        worker.shutdown()
@@ -1,5 +1,8 @@
+import random
+
 from crapette.core.board import Board, HashBoard
 from crapette.core.cards import Card
+from crapette.core.moves import Flip, FlipWaste, Move
 
 
 def test_equal():
@@ -65,3 +68,37 @@ def test_hash_not_equal():
     board2.tableau_piles[0].add_card(card2)
 
     assert hash(board) != hash(board2)
+
+
+def test_bytes_roundtrip():
+    random.seed(0)
+    board = Board()
+    board.new_game(game_config=None)
+
+    board2 = Board.from_bytes(board.to_bytes())
+    assert board2.to_bytes() == board.to_bytes()
+    for pile, pile2 in zip(board.piles, board2.piles, strict=True):
+        assert pile._cards == pile2._cards
+        assert [c.face_up for c in pile] == [c.face_up for c in pile2]
+
+
+def test_play_move_from_other_board():
+    random.seed(0)
+    board = Board()
+    board.new_game(game_config=None)
+    copy = HashBoard(board)
+    stock = copy.players_piles[0].stock
+    waste = copy.players_piles[0].waste
+
+    board.play_move(Flip(stock.top_card, stock), player=0)
+    assert board.players_piles[0].stock.top_card.face_up
+    card = board.players_piles[0].stock.top_card
+    board.play_move(Move(card, stock, waste), player=0)
+    assert board.players_piles[0].waste.top_card is card
+    assert len(board.players_piles[0].stock) == 34
+
+    board.players_piles[0].stock.clear()
+    board.play_move(FlipWaste(), player=0)
+    assert board.players_piles[0].stock.top_card is card
+    assert not card.face_up
+    assert board.players_piles[0].waste.is_empty
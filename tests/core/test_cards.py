@@ -23,3 +23,13 @@ def test_hash_not_equal():
     assert card_hash != hash(Card(2, "s", 0))
     assert card_hash != hash(Card(1, "h", 0))
     assert card_hash != hash(Card(1, "s", 1))
+
+
+def test_byte_roundtrip():
+    card = Card(12, "c", 1)
+    assert Card.from_byte(card.to_byte()) == card
+    assert not Card.from_byte(card.to_byte()).face_up
+
+    card.face_up = True
+    assert card.to_byte() < 256
+    assert Card.from_byte(card.to_byte()).face_up
@@ -0,0 +1,30 @@
+from crapette.core.game_logger import GameLogger
+from crapette.simulate import new_headless_game
+
+
+def _log_moves(path, level):
+    game_config = new_headless_game(0)
+    game_logger = GameLogger(path, level)
+    for step in range(3):
+        game_logger.log_step(step, 0, "flip card up in Stock0", game_config.board)
+    game_logger.close()
+
+
+def test_level_none(tmp_path):
+    path = tmp_path / "log" / "game.txt"
+    _log_moves(path, "none")
+    assert not path.exists()
+
+
+def test_level_moves(tmp_path):
+    path = tmp_path / "log" / "game.txt"
+    _log_moves(path, "moves")
+    text = path.read_text(encoding="utf8")
+    assert text.count("Player 0: flip card up in Stock0") == 3
+    assert "|" not in text
+
+
+def test_level_boards(tmp_path):
+    path = tmp_path / "log" / "game.txt"
+    _log_moves(path, "boards")
+    assert path.read_text(encoding="utf8").count("|") > 3
@@ -0,0 +1,18 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_PATH = Path(__file__).parents[2] / "src"
+
+
+def test_no_kivy_import():
+    """The core and the brain must be usable without the GUI stack."""
+    code = (
+        "import sys\n"
+        "import crapette.core.board, crapette.core.game_config\n"
+        "import crapette.brain.brainforce, crapette.brain.engines, crapette.brain.worker\n"
+        "assert not [m for m in sys.modules if m.startswith('kivy')]\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC_PATH)}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)  # noqa: S603
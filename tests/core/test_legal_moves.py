@@ -0,0 +1,49 @@
+import random
+
+from crapette.core.board import Board
+from crapette.core.legal_moves import LegalMoveIndex
+from crapette.simulate import new_headless_game
+
+
+def test_moves_legal():
+    game_config = new_headless_game(0)
+    board = game_config.board
+    index = LegalMoveIndex(board)
+    for player in Board.PLAYERS:
+        for move in index.moves(player):
+            assert move.card is move.origin.top_card
+            assert move.destination.can_add_card(move.card, move.origin, player)
+        origins = [move.origin for move in index.moves(player)]
+        assert [id(pile) for pile in index.playable_piles(player)] == list(
+            dict.fromkeys(id(pile) for pile in origins)
+        )
+
+
+def test_update_matches_rebuild():
+    game_config = new_headless_game(1)
+    board = game_config.board
+    index = LegalMoveIndex(board)
+    for _ in range(50):
+        player = game_config.active_player
+        if flips := index.flips(player):
+            flip = random.choice(flips)
+            flip.card.face_up = True
+            index.update(flip.pile)
+        else:
+            move = random.choice(index.moves(player))
+            board.play_move(move, player)
+            index.update(move.origin, move.destination)
+            if move.destination is board.players_piles[player].waste:
+                game_config.active_player = 1 - player
+
+        for player in Board.PLAYERS:
+            assert index.moves(player) == LegalMoveIndex(board).moves(player)
+
+
+def test_destinations():
+    game_config = new_headless_game(2)
+    board = game_config.board
+    index = LegalMoveIndex(board)
+    player = game_config.active_player
+    for move in index.moves(player):
+        assert move.destination in index.destinations(move.origin, player)
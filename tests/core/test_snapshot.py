@@ -0,0 +1,49 @@
+import pytest
+
+from crapette.core.moves import Move
+from crapette.core.snapshot import (
+    dump_snapshot,
+    load_snapshot,
+    load_snapshots,
+    save_snapshots,
+)
+from crapette.simulate import new_headless_game
+
+
+def test_round_trip():
+    game_config = new_headless_game(0)
+    game_config.player_types = ("player", "ai")
+    board = game_config.board
+    card = board.players_piles[0].stock.pop_card()
+    board.players_piles[0].waste.add_card(card)
+    game_config.last_move = Move(
+        card, board.players_piles[0].stock, board.players_piles[0].waste
+    )
+    game_config.active_player = 1
+    game_config.step = 300
+
+    loaded = load_snapshot(dump_snapshot(game_config))
+    assert loaded.player_types == ("player", "ai")
+    assert loaded.active_player == 1
+    assert loaded.step == 300
+    assert not loaded.crapette_mode
+    assert loaded.board.to_bytes() == board.to_bytes()
+    assert loaded.last_move.card is loaded.board.players_piles[0].waste.top_card
+    assert loaded.last_move.origin is loaded.board.players_piles[0].stock
+    assert loaded.last_move.destination is loaded.board.players_piles[0].waste
+
+
+def test_corpus(tmp_path):
+    path = tmp_path / "corpus.snapshot"
+    game_configs = [new_headless_game(seed) for seed in range(3)]
+    save_snapshots(path, game_configs)
+    loaded = load_snapshots(path)
+    assert [g.board.to_bytes() for g in loaded] == [
+        g.board.to_bytes() for g in game_configs
+    ]
+    assert all(g.last_move is None for g in loaded)
+
+
+def test_invalid():
+    with pytest.raises(ValueError, match="Invalid snapshot"):
+        load_snapshot(b"CRTR" + dump_snapshot(new_headless_game(0))[4:])
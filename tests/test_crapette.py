@@ -0,0 +1,17 @@
+import pytest
+
+from crapette.crapette import parse_args
+
+
+def test_speed():
+    assert parse_args(["--speed", "2"]).animation_speed == 2
+    for speed in ("0", "-1"):
+        with pytest.raises(SystemExit):
+            parse_args(["--speed", speed])
+
+
+def test_custom():
+    assert parse_args(["--custom", "empty_stock"]).custom_game == "empty_stock"
+    for name in ("game_names", "Board"):
+        with pytest.raises(SystemExit):
+            parse_args(["--custom", name])
@@ -0,0 +1,25 @@
+from crapette.brain.config import BrainConfig
+from crapette.game_record import GameRecord
+from crapette.simulate import GameStats, new_headless_game, play_turn
+
+
+def test_replay(tmp_path):
+    game_config = new_headless_game(seed=1)
+    record = GameRecord(seed=1, first_player=game_config.active_player)
+    stats = GameStats(seed=1)
+    for _ in range(6):
+        player = game_config.active_player
+        moves = []
+        play_turn(game_config, BrainConfig(), stats, moves)
+        for move in moves:
+            record.add_move(player, move)
+
+    path = tmp_path / "game.jsonl"
+    record.save(path)
+    loaded = GameRecord.load(path)
+    assert loaded == record
+
+    for step, replayed in enumerate(loaded.replay(), start=1):
+        assert replayed.step == step
+    assert step == len(record.moves)
+    assert replayed.board.to_bytes() == game_config.board.to_bytes()
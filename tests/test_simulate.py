@@ -0,0 +1,23 @@
+from crapette.brain.config import BrainConfig
+from crapette.simulate import GameStats, new_headless_game, play_turn
+
+
+def test_play_turn_on_move():
+    game_config = new_headless_game(seed=1)
+    player = game_config.active_player
+    played_moves = []
+    boards = []
+
+    def on_move(_move):
+        boards.append((game_config.step, game_config.board.to_bytes()))
+
+    play_turn(game_config, BrainConfig(), GameStats(seed=1), played_moves, on_move)
+    assert len(boards) == len(played_moves)
+
+    # Same boards as when replaying the moves one by one
+    replayed = new_headless_game(seed=1)
+    for encoded_move, (step, board) in zip(played_moves, boards, strict=True):
+        (move,) = replayed.board.decode_moves([encoded_move])
+        replayed.board.play_move(move, player)
+        replayed.step += 1
+        assert (replayed.step, replayed.board.to_bytes()) == (step, board)
@@ -0,0 +1,67 @@
+import pytest
+
+from crapette.core.cards import Card
+from crapette.crapette import AppConfig, CrapetteApp
+from crapette.images import card_data
+
+
+@pytest.fixture
+def card_images(tmp_path, monkeypatch):
+    """Use blank card images if they are not installed, see images/README.rst."""
+    if card_data.available_tiers():
+        return
+    from kivy.core.image import Image as CoreImage  # noqa: PLC0415
+    from kivy.graphics.texture import Texture  # noqa: PLC0415
+
+    monkeypatch.setattr(card_data.CARD_IMG, "DIR", tmp_path)
+    monkeypatch.setattr(card_data, "_img_textures", {})
+    monkeypatch.setattr(card_data, "_card_textures", {})
+    texture = Texture.create(size=(2, 3))
+    texture.blit_buffer(bytes(2 * 3 * 4), colorfmt="rgba")
+    tier_path = card_data.tier_path(card_data.CARD_IMG.tier)
+    tier_path.mkdir()
+    for player in Card.PLAYERS:
+        for suit in Card.SUITS:
+            for rank in Card.RANKS:
+                card = Card(rank, suit, player)
+                for face_up in (False, True):
+                    card.face_up = face_up
+                    path = tier_path / f"{card_data.card_img_name(card)}.png"
+                    if not path.exists():
+                        CoreImage(texture).save(str(path))
+
+
+@pytest.fixture
+def app():
+    app = CrapetteApp(AppConfig(game_log="none"))
+    app._run_prepare()
+    app.do_resize(app.root.width, app.root.height)  # Scheduled at startup
+    yield app
+    app.stop()
+
+
+@pytest.mark.usefixtures("card_images")
+def test_reused_widgets_after_win(app):
+    game_manager = app.game_manager
+    board_widget = game_manager.board_widget
+
+    # Play the Diamonds King on its foundation to win
+    game_manager.setup("player", "player", custom_game="foundation_to_fill")
+    tableau = board_widget.board.tableau_piles[0]
+    king_widget = board_widget.card_widgets[tableau.top_card]
+    foundation_widget = board_widget.widget_from_pile(
+        board_widget.board.foundation_piles[0]
+    )
+    game_manager.move_card(king_widget, foundation_widget)
+    # As if the new game stopped a flip animation
+    king_widget.size = (app.card_width, 0)
+    king_widget.rotation = 45
+    assert game_manager.game_config.active_player is None
+    assert not any(king_widget.do_translation)
+
+    game_manager.setup("player", "player", seed=0)
+    assert board_widget.card_widgets[king_widget.card] is king_widget
+    for card_widget in board_widget.card_widgets.values():
+        assert all(card_widget.do_translation)
+        assert tuple(card_widget.size) == (app.card_width, app.card_height)
+    assert king_widget.rotation == 0
@@ -0,0 +1,56 @@
+from crapette.widgets.pile_index import PileIndex, overlap_area
+
+
+def test_overlap_area():
+    assert overlap_area((0, 0, 10, 10), (5, 5, 10, 10)) == 25
+    assert overlap_area((0, 0, 10, 10), (2, 3, 4, 5)) == 20
+    # Touching or apart
+    assert overlap_area((0, 0, 10, 10), (10, 0, 10, 10)) == 0
+    assert overlap_area((0, 0, 10, 10), (20, 20, 10, 10)) == 0
+
+
+def test_best_overlap_between_two_piles():
+    index = PileIndex(10, 10)
+    index.add("left", (0, 0, 10, 10))
+    index.add("right", (12, 0, 10, 10))
+    assert index.best_overlap((4, 0, 10, 10)) == "left"
+    assert index.best_overlap((8, 0, 10, 10)) == "right"
+
+
+def test_rect_spanning_several_cells():
+    index = PileIndex(10, 10)
+    # A tableau spread over 2 x 3 cells
+    tableau = (0, 0, 20, 30)
+    index.add("tableau", tableau)
+    assert index._cells.keys() == {(i, j) for i in range(2) for j in range(3)}
+    assert all(
+        [item for item, _ in items] == ["tableau"] for items in index._cells.values()
+    )
+
+    # Overlapping 4 cells, the area is on the whole region, not on a cell
+    card = (5, 5, 10, 10)
+    assert overlap_area(card, tableau) == 100
+    index.add("foundation", (14, 5, 10, 10))
+    assert overlap_area(card, (14, 5, 10, 10)) < 100
+    assert index.best_overlap(card) == "tableau"
+
+
+def test_drop_outside_every_region():
+    index = PileIndex(10, 10)
+    index.add("left", (0, 0, 10, 10))
+    index.add("right", (30, 0, 10, 10))
+    assert index.best_overlap((15, 0, 10, 10)) is None
+    assert index.best_overlap((100, 100, 10, 10)) is None
+
+
+def test_negative_coordinates():
+    index = PileIndex(10, 10)
+    index.add("pile", (-15, -5, 10, 10))
+    assert set(index._cells_of((-15, -5, 10, 10))) == {
+        (-2, -1),
+        (-2, 0),
+        (-1, -1),
+        (-1, 0),
+    }
+    assert index.best_overlap((-12, -8, 10, 10)) == "pile"
+    assert index.best_overlap((-3, -3, 2, 2)) is None